@@ -43,8 +43,10 @@ def _addr_to_str(address: tuple[str, int]) -> str:
       address: Address tuple to transform.
       
   Returns:
-      Formatted string: 'address[0]:address[1]'
+      Formatted string: 'address[0]:address[1]', with IPv6 hosts in brackets.
   """
+  if ':' in address[0]:
+    return f'[{address[0]}]:{address[1]}'
   return f'{address[0]}:{address[1]}'
 
 
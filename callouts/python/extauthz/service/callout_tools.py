@@ -24,6 +24,16 @@ from envoy.type.v3 import http_status_pb2
 from google.rpc import status_pb2
 
 
+def _header_options(
+        headers: list[tuple[str, str]]) -> list[base_pb2.HeaderValueOption]:
+    """Build a HeaderValueOption for each (key, value) pair."""
+    return [
+        base_pb2.HeaderValueOption(
+            header=base_pb2.HeaderValue(key=key, value=value))
+        for key, value in headers
+    ]
+
+
 def allow_request(headers_to_add: list[tuple[str, str]] = None) -> auth_pb2.CheckResponse:
     """Create an allowed response with optional headers.
     
@@ -40,10 +50,7 @@ def allow_request(headers_to_add: list[tuple[str, str]] = None) -> auth_pb2.Chec
     """
     ok_response = auth_pb2.OkHttpResponse()
     if headers_to_add:
-        for key, value in headers_to_add:
-            header_value = base_pb2.HeaderValue(key=key, value=value)
-            header_option = base_pb2.HeaderValueOption(header=header_value)
-            ok_response.headers.append(header_option)
+        ok_response.headers.extend(_header_options(headers_to_add))
     
     return auth_pb2.CheckResponse(
         status=status_pb2.Status(code=0),
@@ -76,10 +83,7 @@ def deny_request(status_code: http_status_pb2.StatusCode = http_status_pb2.Statu
         denied_response.body = body
         
     if headers:
-        for key, value in headers:
-            header_value = base_pb2.HeaderValue(key=key, value=value)
-            header_option = base_pb2.HeaderValueOption(header=header_value)
-            denied_response.headers.append(header_option)
+        denied_response.headers.extend(_header_options(headers))
     
     return auth_pb2.CheckResponse(
         denied_response=denied_response
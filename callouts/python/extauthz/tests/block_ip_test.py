@@ -79,7 +79,7 @@ def wait_till_server(server_check: Callable[[], bool], timeout: int = 10):
     """
     expiration = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
     while not server_check() and datetime.datetime.now() < expiration:
-        time.sleep(1)
+        time.sleep(0.01)
 
 
 def _start_server(server: CalloutServerAuth) -> threading.Thread:
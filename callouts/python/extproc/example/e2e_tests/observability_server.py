@@ -51,10 +51,10 @@ class ObservabilityServerExample(callout_server.CalloutServer):
     counter_http_server_thread.daemon = True
     counter_http_server_thread.start()
 
-  def shutdown(self):
+  def shutdown(self, grace: float = 10):
     self.counter_http_server.server_close()
     self.counter_http_server.shutdown()
-    return super().shutdown()
+    return super().shutdown(grace)
 
   def on_request_headers(self, headers: service_pb2.HttpHeaders,
                          context: ServicerContext) -> HeadersResponse:
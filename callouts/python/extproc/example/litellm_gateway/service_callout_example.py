@@ -176,9 +176,10 @@ class LiteLLMGatewayCallout(callout_server.CalloutServer):
     ) -> service_pb2.ProcessingResponse | None:
         path, method = "", ""
         for h in headers.headers.headers:
-            if h.key == ":path":
+            key = h.key
+            if key == ":path":
                 path = h.raw_value.decode("utf-8")
-            elif h.key == ":method":
+            elif key == ":method":
                 method = h.raw_value.decode("utf-8")
         logging.info("Request %s %s", method, path)
 
@@ -278,12 +279,13 @@ class LiteLLMGatewayCallout(callout_server.CalloutServer):
                 continue
             rewrites.append((k.lower(), v))
 
-        for k, v in rewrites:
-            body_resp.response.header_mutation.set_headers.append(
-                HeaderValueOption(
-                    header=HeaderValue(key=k, raw_value=v.encode("utf-8")),
-                    append_action=HeaderValueOption.OVERWRITE_IF_EXISTS_OR_ADD,
-                ))
+        body_resp.response.header_mutation.set_headers.extend([
+            HeaderValueOption(
+                header=HeaderValue(key=k, raw_value=v.encode("utf-8")),
+                append_action=HeaderValueOption.OVERWRITE_IF_EXISTS_OR_ADD,
+            )
+            for k, v in rewrites
+        ])
 
         # We don't set clear_route_cache here. GCP traffic extensions can't
         # switch backends after URL map evaluation; routing was already
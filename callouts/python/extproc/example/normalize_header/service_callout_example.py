@@ -13,20 +13,35 @@
 # limitations under the License.
 
 import logging
+import re
 from grpc import ServicerContext
 from envoy.service.ext_proc.v3 import external_processor_pb2 as service_pb2
 from extproc.service import callout_tools
 from extproc.service import callout_server
 
 
-def get_device_type(host_value: str) -> str:
-  """Determine device type based on user agent."""
+_HOST_KEY = ':authority'
+_DEVICE_HOST_RE = re.compile(rb'([mt])\.example\.com')
+_DEVICE_TYPES = {b'm': 'mobile', b't': 'tablet'}
 
-  if 'm.example.com' in host_value:
-    return 'mobile'
-  elif 't.example.com' in host_value:
-    return 'tablet'
-  return 'desktop'
+
+def get_device_type(host_value: bytes | str) -> str:
+  """Determine device type based on the raw host header value."""
+
+  if isinstance(host_value, str):
+    host_value = host_value.encode('utf-8')
+  match = _DEVICE_HOST_RE.search(host_value)
+  return _DEVICE_TYPES[match.group(1)] if match else 'desktop'
+
+
+# Serialized responses for every device type, built once at import.
+_DEVICE_TYPE_RESPONSES: dict[str, bytes] = {
+    device_type:
+        callout_tools.add_header_mutation(
+            add=[('client-device-type', device_type)],
+            clear_route_cache=True).SerializeToString()
+    for device_type in ('mobile', 'tablet', 'desktop')
+}
 
 
 class CalloutServerExample(callout_server.CalloutServer):
@@ -47,18 +62,16 @@ class CalloutServerExample(callout_server.CalloutServer):
       The constructed HeadersResponse object.
     """
 
-    host_value = next((header.raw_value.decode('utf-8')
-                       for header in headers.headers.headers
-                       if header.key == ':authority'), None)
-
-    header_mutation = service_pb2.HeadersResponse()
-
-    if host_value:
-      device_type = get_device_type(host_value)
-      header_mutation = callout_tools.add_header_mutation(
-          add=[('client-device-type', device_type)], clear_route_cache=True)
+    host_value = None
+    for header in headers.headers.headers:
+      if header.key == _HOST_KEY:
+        host_value = header.raw_value
+        break
 
-    return header_mutation
+    if not host_value:
+      return service_pb2.HeadersResponse()
+    return service_pb2.HeadersResponse.FromString(
+        _DEVICE_TYPE_RESPONSES[get_device_type(host_value)])
 
   def on_request_headers(
       self, headers: service_pb2.HttpHeaders,
@@ -19,13 +19,23 @@ Bundled with an optional health check server.
 Can be set up to use ssl certificates.
 """
 
+from __future__ import annotations
+
+import asyncio
 from concurrent import futures
+import functools
 from http.server import BaseHTTPRequestHandler
-from http.server import HTTPServer
+from http.server import ThreadingHTTPServer
 import logging
+import multiprocessing
+import os
+import signal
+import socket
 import ssl
-from typing import Iterator, Union
-from typing import Iterable
+import sys
+import threading
+from typing import AsyncIterator, Callable, Iterator
+from typing import AsyncIterable, Iterable
 
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpBody
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpHeaders
@@ -40,31 +50,385 @@ from envoy.service.ext_proc.v3.external_processor_pb2_grpc import (
     ExternalProcessorServicer,)
 import grpc
 from google.protobuf.struct_pb2 import Struct
+from extproc.service.command_line_tools import _addr_to_str
 from grpc import ServicerContext
 
+_logger = logging.getLogger(__name__)
+
+# Server channel options sized for callouts carrying full HTTP bodies.
+_DEFAULT_GRPC_OPTIONS: dict[str, int | str] = {
+    'grpc.max_receive_message_length': 64 * 1024 * 1024,
+    'grpc.max_send_message_length': 64 * 1024 * 1024,
+    'grpc.http2.max_frame_size': 1 << 20,
+    'grpc.http2.lookahead_bytes': 8 * 1024 * 1024,
+    'grpc.http2.bdp_probe': 1,
+    'grpc.http2.write_buffer_size': 512 * 1024,
+    'grpc.http2.min_time_between_pings_ms': 10_000,
+    'grpc.keepalive_time_ms': 30_000,
+    'grpc.keepalive_timeout_ms': 5_000,
+    'grpc.keepalive_permit_without_calls': 1,
+    'grpc.max_concurrent_streams': 1000,
+    'grpc.http2.max_pings_without_data': 0,
+    'grpc.so_reuseport': 1,
+}
+
+
+# Server attributes that are not sent to worker processes.
+_PROCESS_LOCAL_STATE = (
+    '_health_check_server',
+    '_ready',
+    '_callout_server',
+    '_workers',
+    '_reserved_sockets',
+    'health_check_ssl_context',
+)
+
+
+def _log_malformed(callout: ProcessingRequest) -> None:
+  """Log a callout whose handler returned an unsupported result.
+
+  Only the request kind is logged at WARNING, the full message is rendered
+  only when DEBUG logging is enabled.
+  """
+  _logger.warning("MALFORMED CALLOUT %r", callout.WhichOneof('request'))
+  if _logger.isEnabledFor(logging.DEBUG):
+    _logger.debug("Malformed callout contents: %s", callout)
+
+
+def _read_cert_file(path: str | None) -> bytes | None:
+  """Read a cert or key file, cached across server instances.
 
-def _addr_to_str(address: tuple[str, int]) -> str:
-  """Take in an address tuple and returns a formated ip string.
+  The cache is keyed by modification time as well as path, so a rotated file
+  is read again.
+  """
+  if path:
+    _logger.info("Attempting to read cert/key file at: '%s'", path)
+    try:
+      content = _read_cert_cached(path, os.stat(path).st_mtime_ns)
+      if content:
+        _logger.info("Successfully read '%s'.", path)
+      else:
+        _logger.warning("File at '%s' is empty.", path)
+      return content
+    except FileNotFoundError:
+      _logger.error("File not found at '%s'.", path)
+    except Exception as e:
+      _logger.error("Failed to read '%s': %s", path, e, exc_info=True)
+  return None
+
+
+@functools.lru_cache(maxsize=8)
+def _read_cert_cached(path: str, mtime_ns: int) -> bytes:
+  with open(path, 'rb') as file:
+    return file.read()
+
+
+def _dispatch(
+    result: (HeadersResponse | BodyResponse | ImmediateResponse
+             | ProcessingResponse | None),
+    field_name: str,
+    response_type: type[HeadersResponse] | type[BodyResponse],
+) -> ProcessingResponse | None:
+  """Wrap the result of a callout callback in a ProcessingResponse.
 
   Args:
-      address: Address to transform.
+      result: Value returned by the callback.
+      field_name: ProcessingResponse field holding `response_type` results.
+      response_type: Expected mutation type for the callback.
 
   Returns:
-      str: f'{address[0]}:{address[1]}'
+      ProcessingResponse: The response to send, or None if the result has an
+      unexpected type.
+  """
+  if result is None:
+    return ProcessingResponse()
+  if isinstance(result, response_type):
+    return _wrap(result, field_name)
+  if isinstance(result, ImmediateResponse):
+    return _wrap(result, 'immediate_response')
+  if isinstance(result, ProcessingResponse):
+    return result
+  return None
+
+
+def _wrap(result: HeadersResponse | BodyResponse | ImmediateResponse,
+          field_name: str) -> ProcessingResponse:
+  """Set `result` on the `field_name` field of a new ProcessingResponse.
+
+  Merging into the field skips the keyword argument handling of the message
+  constructor. SetInParent keeps the field present for empty results.
   """
-  return f'{address[0]}:{address[1]}'
+  response = ProcessingResponse()
+  field = getattr(response, field_name)
+  field.SetInParent()
+  field.MergeFrom(result)
+  return response
 
 
 class HealthCheckService(BaseHTTPRequestHandler):
-  """Server for responding to health check pings."""
+  """Server for responding to health check pings.
+
+  Speaks HTTP/1.1 so probers can keep their connection open between probes.
+  Idle connections are closed after `timeout` seconds, so they do not hold a
+  server thread forever.
+  """
+
+  protocol_version = 'HTTP/1.1'
+  timeout = 5
 
   def do_GET(self) -> None:
     """Returns an empty page with 200 status code."""
     self.send_response(200)
+    self.send_header('Content-Length', '0')
     self.end_headers()
 
 
-class CalloutServer:
+class _ServerLifecycleMixin:
+  """Serving loop, worker processes and shutdown shared by the callout servers.
+
+  The server classes provide the listening addresses (`secure_address`,
+  `plaintext_address` and `health_check_address`), `disable_tls`,
+  `num_processes`, `pin_worker_cpus`, the health check TLS settings and
+  `_create_callout_service`.
+  """
+
+  # Attributes that are not sent to worker processes.
+  _process_local_state: tuple[str, ...] = _PROCESS_LOCAL_STATE
+  # Modules imported by the forkserver before it forks the workers.
+  _forkserver_preload: list[str] = [__name__]
+
+  def __getstate__(self) -> dict:
+    """Drop process local state when the server is sent to a worker."""
+    state = self.__dict__.copy()
+    for key in self._process_local_state:
+      state.pop(key, None)
+    return state
+
+  def __setstate__(self, state: dict) -> None:
+    self.__dict__.update(state)
+    self._health_check_server = None
+    self._ready = threading.Event()
+    self._callout_server = None
+    self._workers = []
+    self._reserved_sockets = []
+
+  def run(self) -> None:
+    """Start all requested servers and listen for new connections; blocking."""
+    self._start_servers()
+    self._setup = True
+    self._ready.set()
+    try:
+      self._loop_server()
+    except KeyboardInterrupt:
+      _logger.info('Server interrupted')
+    finally:
+      self._stop_servers()
+      self._closed = True
+
+  def _start_servers(self) -> None:
+    """Start the requested servers."""
+    # Start the workers before binding the health check socket, the server is
+    # pickled to the workers and must not carry it.
+    if self.num_processes > 1:
+      self._start_workers()
+    if self.health_check_address:
+      self._start_health_check_server()
+    if self._callout_server:
+      self._callout_server.start()
+
+  def _start_health_check_server(self) -> None:
+    """Bind the health check server to the health check address."""
+    self._health_check_server = ThreadingHTTPServer(self.health_check_address,
+                                                    HealthCheckService)
+    protocol = 'HTTP'
+    if self.secure_health_check:
+      protocol = 'HTTPS'
+      self._health_check_server.socket = (
+        self.health_check_ssl_context.wrap_socket(
+          sock=self._health_check_server.socket,))
+
+    _logger.info('%s health check server bound to %s.', protocol,
+                 _addr_to_str(self.health_check_address))
+
+  def _start_workers(self) -> None:
+    """Start the grpc worker processes from a forkserver.
+
+    Workers are forked from a clean server process with the server module
+    preloaded instead of from the parent, which may already run threads.
+    """
+    if sys.platform.startswith('linux'):
+      self._reserve_ports()
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(self._forkserver_preload)
+    cpus = None
+    if self.pin_worker_cpus:
+      cpus = _worker_cpus(self.num_processes)
+    for index in range(self.num_processes):
+      worker = context.Process(target=_run_grpc_worker,
+                               args=(self, cpus[index] if cpus else None))
+      worker.start()
+      self._workers.append(worker)
+    _logger.info('Started %d GRPC worker processes.', self.num_processes)
+
+  def _reserve_ports(self) -> None:
+    """Bind the callout addresses in the parent before starting the workers.
+
+    The sockets are bound with SO_REUSEPORT but never listen, so the kernel
+    only balances connections between the workers. Holding them keeps other
+    processes off the ports, and resolves port 0 to a single port shared by
+    every worker.
+    """
+    if not self.disable_tls:
+      self.secure_address = _reserve_port(self.secure_address,
+                                          self._reserved_sockets)
+    if self.plaintext_address:
+      self.plaintext_address = _reserve_port(self.plaintext_address,
+                                             self._reserved_sockets)
+
+  def _signal_workers(self) -> None:
+    """Send SIGTERM to the grpc worker processes, starting a graceful stop."""
+    for worker in self._workers:
+      worker.terminate()
+
+  def _stop_workers(self) -> None:
+    """Signal the grpc worker processes to stop and wait for them to exit."""
+    self._signal_workers()
+    for worker in self._workers:
+      worker.join(timeout=15)
+      if worker.is_alive():
+        worker.kill()
+    self._workers = []
+    for sock in self._reserved_sockets:
+      sock.close()
+    self._reserved_sockets = []
+
+  def _stop_servers(self) -> None:
+    """Close the sockets of all servers, and trigger shutdowns."""
+    if self._health_check_server:
+      self._health_check_server.server_close()
+      self._health_check_server.shutdown()
+      _logger.info('Health check server stopped.')
+
+    if self._callout_server:
+      self._callout_server.stop()
+    if self._workers:
+      self._stop_workers()
+
+  def _loop_server(self) -> None:
+    """Loop server forever, calling shutdown will cause the server to stop."""
+
+    # We chose the main serving thread based on what server configuration
+    # was requested. Defaults to the health check thread.
+    if self._health_check_server:
+      _logger.info("Health check server started.")
+      self._health_check_server.serve_forever()
+    elif self._workers:
+      # Wait on the grpc worker processes.
+      for worker in self._workers:
+        worker.join()
+    else:
+      # If the only server requested is a grpc callout server, we wait on the grpc server.
+      self._callout_server.loop()
+
+  def _serve_worker(self) -> None:
+    """Serve callouts from a worker process until it is interrupted."""
+    callout_server = self._create_callout_service()
+    callout_server.start()
+    try:
+      callout_server.loop()
+    finally:
+      callout_server.stop()
+
+  def shutdown(self, grace: float = 10) -> None:
+    """Tell the server to shutdown, ending all serving threads.
+
+    Args:
+        grace: Seconds in-flight callouts are given to complete before they
+          are cancelled.
+    """
+    if self._health_check_server:
+      self._health_check_server.shutdown()
+    if self._callout_server:
+      self._callout_server.stop(grace)
+    self._signal_workers()
+
+
+class _AsyncServerLifecycleMixin(_ServerLifecycleMixin):
+  """Runs a callout server on a grpc.aio event loop.
+
+  The server classes provide `_create_async_callout_service`, creating their
+  grpc.aio service.
+  """
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self._loop: asyncio.AbstractEventLoop | None = None
+
+  def _create_callout_service(self) -> None:
+    # The aio server has to be created within the event loop started by run.
+    return None
+
+  def run(self) -> None:
+    """Start all requested servers and listen for new connections; blocking."""
+    if self.num_processes > 1:
+      # The event loops live in the workers, the parent only supervises them.
+      super().run()
+      return
+    try:
+      asyncio.run(self.run_async())
+    except KeyboardInterrupt:
+      _logger.info('Server interrupted')
+
+  async def run_async(self) -> None:
+    """Start all requested servers and serve until shutdown."""
+    self._loop = asyncio.get_running_loop()
+    self._callout_server = self._create_async_callout_service()
+    if self.health_check_address:
+      self._start_health_check_server()
+      threading.Thread(target=self._health_check_server.serve_forever,
+                       daemon=True).start()
+      _logger.info("Health check server started.")
+    await self._callout_server.start()
+    self._setup = True
+    self._ready.set()
+    try:
+      await self._callout_server.loop()
+    finally:
+      await self._callout_server.stop()
+      if self._health_check_server:
+        self._health_check_server.server_close()
+        self._health_check_server.shutdown()
+        _logger.info('Health check server stopped.')
+      self._closed = True
+
+  def _serve_worker(self) -> None:
+    asyncio.run(self._serve_worker_async())
+
+  async def _serve_worker_async(self) -> None:
+    """Serve callouts on the worker's event loop until it is interrupted."""
+    callout_server = self._create_async_callout_service()
+    await callout_server.start()
+    try:
+      await callout_server.loop()
+    finally:
+      await callout_server.stop()
+
+  def shutdown(self, grace: float = 10) -> None:
+    """Tell the server to shutdown, ending the event loop.
+
+    Args:
+        grace: Seconds in-flight callouts are given to complete before they
+          are cancelled.
+    """
+    if self._health_check_server:
+      self._health_check_server.shutdown()
+    if self._callout_server and self._loop:
+      asyncio.run_coroutine_threadsafe(self._callout_server.stop(grace),
+                                       self._loop)
+    self._signal_workers()
+
+
+class CalloutServer(_ServerLifecycleMixin):
   """Server wrapper for managing callout servers and processing callouts.
 
   Attributes:
@@ -84,10 +448,26 @@ class CalloutServer:
     cert_chain_path: Relative file path to the cert_chain.
     private_key: PEM private key of the server.
     private_key_path: Relative file path pointing to a file containing private_key data.
-    server_thread_count: Threads allocated to the main grpc service.
+    server_thread_count: Threads allocated to the main grpc service, per
+      process. Defaults to the usable CPUs split between the processes,
+      clamped to between 2 and 8.
     disable_tls: If True, disables the secure (TLS) server. Defaults to False.
+    num_processes: Number of grpc worker processes to start. When greater
+      than 1, each worker binds the same addresses with SO_REUSEPORT and the
+      kernel balances connections between them, allowing CPU bound callouts to
+      scale past the GIL. Workers are started from a forkserver, so the server
+      instance must be picklable. Requires a platform supporting forkserver
+      and SO_REUSEPORT (Linux).
+    pin_worker_cpus: If True, and there are at least num_processes usable
+      CPUs, pins each worker process to a distinct CPU of the parent's
+      affinity set. Only pin when the server has those CPUs to itself.
+      Defaults to False.
+    grpc_options: Channel arguments for the grpc server, as (key, value) pairs.
+      Entries override the matching defaults in _DEFAULT_GRPC_OPTIONS.
   """
 
+  _process_local_state = _PROCESS_LOCAL_STATE + ('_handlers',)
+
   def __init__(
     self,
     secure_address: tuple[str, int] | None = None,
@@ -102,12 +482,21 @@ class CalloutServer:
     cert_chain_path: str | None = './extproc/ssl_creds/chain.pem',
     private_key: bytes | None = None,
     private_key_path: str = './extproc/ssl_creds/privatekey.pem',
-    server_thread_count: int = 2,
+    server_thread_count: int | None = None,
+    num_processes: int = 1,
+    grpc_options: list[tuple[str, int | str]] | None = None,
+    pin_worker_cpus: bool = False,
   ):
     self._setup = False
+    # Set once the servers are started, for callers waiting on startup.
+    self._ready = threading.Event()
     self._shutdown = False
     self._closed = False
-    self._health_check_server: HTTPServer | None = None
+    self._health_check_server: ThreadingHTTPServer | None = None
+    self._callout_server: _GRPCCalloutService | None = None
+    self._workers: list[multiprocessing.Process] = []
+    self._reserved_sockets: list[socket.socket] = []
+    self._handlers = self._build_handlers()
     default_ip = default_ip or '0.0.0.0'
 
     self.secure_address: tuple[str, int] = secure_address or (default_ip, 443)
@@ -126,30 +515,23 @@ class CalloutServer:
       raise ValueError(
           'At least one of secure (TLS) or plaintext listeners must be enabled.')
 
-    def _read_cert_file(path: str | None) -> bytes | None:
-      if path:
-        logging.info(f"Attempting to read cert/key file at: '{path}'")
-        try:
-          with open(path, 'rb') as file:
-            content = file.read()
-            if content:
-              logging.info(f"Successfully read '{path}'.")
-            else:
-              logging.warning(f"File at '{path}' is empty.")
-            return content
-        except FileNotFoundError:
-          logging.error(f"File not found at '{path}'.")
-        except Exception as e:
-          logging.error(f"Failed to read '{path}': {e}", exc_info=True)
-      return None
-
-    self.server_thread_count = server_thread_count
-    self.secure_health_check = secure_health_check
-    # Read cert data.
-    self.private_key = private_key or _read_cert_file(private_key_path)
-    self.cert_chain = cert_chain or _read_cert_file(cert_chain_path)
+    if num_processes < 1:
+      raise ValueError('num_processes must be at least 1.')
+    self.num_processes = num_processes
+    self.pin_worker_cpus = pin_worker_cpus
+    self.grpc_options = list(
+        (_DEFAULT_GRPC_OPTIONS | dict(grpc_options or ())).items())
 
+    self.server_thread_count = server_thread_count or max(
+        2, min(8, (os.cpu_count() or 1) // self.num_processes))
+    self.secure_health_check = secure_health_check
+    # Cert data is only needed by the secure grpc port, the secure health
+    # check loads its files from the paths directly.
+    self.private_key = private_key
+    self.cert_chain = cert_chain
     if not self.disable_tls:
+      self.private_key = private_key or _read_cert_file(private_key_path)
+      self.cert_chain = cert_chain or _read_cert_file(cert_chain_path)
       if not self.private_key:
         raise ValueError(
             'TLS is enabled but private key is not provided. '
@@ -161,73 +543,39 @@ class CalloutServer:
 
     if secure_health_check:
       if not private_key_path:
-        logging.error("Secure health check requires a private_key_path.")
-        return
-      if not cert_chain_path:
-        logging.error("Secure health check requires a cert_chain_path.")
-        return
-      self.health_check_ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-      self.health_check_ssl_context.load_cert_chain(certfile=cert_chain_path,
-                                                    keyfile=private_key_path)
-
-    self._callout_server = _GRPCCalloutService(self)
-
-  def run(self) -> None:
-    """Start all requested servers and listen for new connections; blocking."""
-    self._start_servers()
-    self._setup = True
-    try:
-      self._loop_server()
-    except KeyboardInterrupt:
-      logging.info('Server interrupted')
-    finally:
-      self._stop_servers()
-      self._closed = True
-
-  def _start_servers(self) -> None:
-    """Start the requested servers."""
-    if self.health_check_address:
-      self._health_check_server = HTTPServer(self.health_check_address,
-                                             HealthCheckService)
-      protocol = 'HTTP'
-      if self.secure_health_check:
-        protocol = 'HTTPS'
-        self._health_check_server.socket = (
-          self.health_check_ssl_context.wrap_socket(
-            sock=self._health_check_server.socket,))
-
-      logging.info('%s health check server bound to %s.', protocol,
-                   _addr_to_str(self.health_check_address))
-    self._callout_server.start()
-
-  def _stop_servers(self) -> None:
-    """Close the sockets of all servers, and trigger shutdowns."""
-    if self._health_check_server:
-      self._health_check_server.server_close()
-      self._health_check_server.shutdown()
-      logging.info('Health check server stopped.')
-
-    if self._callout_server:
-      self._callout_server.stop()
-
-  def _loop_server(self) -> None:
-    """Loop server forever, calling shutdown will cause the server to stop."""
+        _logger.error("Secure health check requires a private_key_path.")
+      elif not cert_chain_path:
+        _logger.error("Secure health check requires a cert_chain_path.")
+      else:
+        self.health_check_ssl_context = ssl.SSLContext(
+            ssl.PROTOCOL_TLS_SERVER)
+        self.health_check_ssl_context.load_cert_chain(
+            certfile=cert_chain_path, keyfile=private_key_path)
+
+    # Worker processes create their own grpc server, the parent does not
+    # serve callouts itself.
+    if self.num_processes == 1:
+      self._callout_server = self._create_callout_service()
+
+  def __setstate__(self, state: dict) -> None:
+    super().__setstate__(state)
+    self._handlers = self._build_handlers()
+
+  def _build_handlers(self) -> dict[str, tuple[Callable, type]]:
+    """Map each ProcessingRequest `request` oneof field to its callback.
+
+    The response is set on the ProcessingResponse field of the same name.
+    """
+    return {
+        'request_headers': (self.on_request_headers, HeadersResponse),
+        'response_headers': (self.on_response_headers, HeadersResponse),
+        'request_body': (self.on_request_body, BodyResponse),
+        'response_body': (self.on_response_body, BodyResponse),
+    }
 
-    # We chose the main serving thread based on what server configuration
-    # was requested. Defaults to the health check thread.
-    if self._health_check_server:
-      logging.info("Health check server started.")
-      self._health_check_server.serve_forever()
-    else:
-      # If the only server requested is a grpc callout server, we wait on the grpc server.
-      self._callout_server.loop()
-
-  def shutdown(self) -> None:
-    """Tell the server to shutdown, ending all serving threads."""
-    if self._health_check_server:
-      self._health_check_server.shutdown()
-    if self._callout_server:
-      self._callout_server.stop()
+  def _create_callout_service(self) -> _GRPCCalloutService | None:
+    """Create the grpc service handling the callouts."""
+    return _GRPCCalloutService(self)
 
   def process(
       self,
@@ -243,37 +591,23 @@ class CalloutServer:
     Yields:
         ProcessingResponse: A response for the incoming callout.
     """
-    if callout.HasField('request_headers'):
-      match self.on_request_headers(callout.request_headers, context):
-        case ProcessingResponse() as processing_response:
-          return processing_response
-        case ImmediateResponse() as immediate_headers:
-          return ProcessingResponse(immediate_response=immediate_headers)
-        case HeadersResponse() | None as header_response:
-          return ProcessingResponse(request_headers=header_response)
-        case _:
-          logging.warn("MALFORMED CALLOUT %s", callout)
-    elif callout.HasField('response_headers'):
-      return ProcessingResponse(response_headers=self.on_response_headers(
-          callout.response_headers, context))
-    elif callout.HasField('request_body'):
-      match self.on_request_body(callout.request_body, context):
-        case ImmediateResponse() as immediate_body:
-          return ProcessingResponse(immediate_response=immediate_body)
-        case BodyResponse() | None as body_response:
-          return ProcessingResponse(request_body=body_response)
-        case _:
-          logging.warn("MALFORMED CALLOUT %s", callout)
-    elif callout.HasField('response_body'):
-      return ProcessingResponse(
-          response_body=self.on_response_body(callout.response_body, context))
-    return ProcessingResponse()
+    which = callout.WhichOneof('request')
+    handler = self._handlers.get(which)
+    if handler is None:
+      return ProcessingResponse()
+    callback, response_type = handler
+    response = _dispatch(callback(getattr(callout, which), context),
+                         which, response_type)
+    if response is None:
+      _log_malformed(callout)
+      return ProcessingResponse()
+    return response
 
   def on_request_headers(
       self,
       headers: HttpHeaders,  # pylint: disable=unused-argument
       context: ServicerContext  # pylint: disable=unused-argument
-  ) -> Union[None, HeadersResponse, ImmediateResponse, ProcessingResponse]:
+  ) -> HeadersResponse | ImmediateResponse | ProcessingResponse | None:
     """Process incoming request headers.
 
     Args:
@@ -289,7 +623,7 @@ class CalloutServer:
       self,
       headers: HttpHeaders,  # pylint: disable=unused-argument
       context: ServicerContext  # pylint: disable=unused-argument
-  ) -> Union[None, HeadersResponse]:
+  ) -> HeadersResponse | None:
     """Process incoming response headers.
 
     Args:
@@ -305,7 +639,7 @@ class CalloutServer:
       self,
       body: HttpBody,  # pylint: disable=unused-argument
       context: ServicerContext  # pylint: disable=unused-argument
-  ) -> Union[None, BodyResponse, ImmediateResponse]:
+  ) -> BodyResponse | ImmediateResponse | None:
     """Process an incoming request body.
 
     Args:
@@ -321,7 +655,7 @@ class CalloutServer:
       self,
       body: HttpBody,  # pylint: disable=unused-argument
       context: ServicerContext  # pylint: disable=unused-argument
-  ) -> Union[None, BodyResponse]:
+  ) -> BodyResponse | None:
     """Process an incoming response body.
 
     Args:
@@ -334,38 +668,229 @@ class CalloutServer:
     return None
 
 
-class _GRPCCalloutService(ExternalProcessorServicer):
-  """GRPC based Callout server implementation."""
+class AsyncCalloutServer(_AsyncServerLifecycleMixin, CalloutServer):
+  """Callout server running on the grpc.aio asyncio server.
 
-  def __init__(self, processor, *args, **kwargs):
-    self._processor = processor
-    self._server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=processor.server_thread_count))
-    add_ExternalProcessorServicer_to_server(self, self._server)
-    self._start_msg = 'GRPC callout server started'
-    if not processor.disable_tls:
-      server_credentials = grpc.ssl_server_credentials(
-        private_key_certificate_chain_pairs=[(processor.private_key,
-                                              processor.cert_chain)])
-      address_str = _addr_to_str(processor.secure_address)
-      self._server.add_secure_port(address_str, server_credentials)
-      self._start_msg += f', listening on {address_str} (secure)'
-    if processor.plaintext_address:
-      plaintext_address_str = _addr_to_str(processor.plaintext_address)
-      self._server.add_insecure_port(plaintext_address_str)
-      self._start_msg += f', listening on {plaintext_address_str} (plaintext)'
-
-  def stop(self) -> None:
-    self._server.stop(grace=10)
-    self._server.wait_for_termination(timeout=10)
-    logging.info('GRPC server stopped.')
+  Streams are served as coroutines on a single event loop rather than
+  occupying a thread from a fixed size pool each, which allows many more
+  concurrent callout streams per process.
+
+  The callback methods and `process` are coroutines. To deny a callout, await
+  the abort call on the context: `await context.abort(code, msg)`.
+  Accepts the same arguments as CalloutServer, except for
+  `server_thread_count`. With `num_processes` greater than 1 every worker
+  process runs its own event loop.
+  """
+
+  def _create_async_callout_service(self) -> _AsyncGRPCCalloutService:
+    """Create the grpc.aio service handling the callouts."""
+    return _AsyncGRPCCalloutService(self)
+
+  async def process(
+      self,
+      callout: ProcessingRequest,
+      context: grpc.aio.ServicerContext,
+  ) -> ProcessingResponse:
+    """Process incomming callouts.
+
+    Args:
+        callout: The incomming callout.
+        context: Stream context on the callout.
+
+    Returns:
+        ProcessingResponse: A response for the incoming callout.
+    """
+    which = callout.WhichOneof('request')
+    handler = self._handlers.get(which)
+    if handler is None:
+      return ProcessingResponse()
+    callback, response_type = handler
+    response = _dispatch(await callback(getattr(callout, which), context),
+                         which, response_type)
+    if response is None:
+      _log_malformed(callout)
+      return ProcessingResponse()
+    return response
+
+  async def on_request_headers(
+      self,
+      headers: HttpHeaders,  # pylint: disable=unused-argument
+      context: grpc.aio.ServicerContext  # pylint: disable=unused-argument
+  ) -> HeadersResponse | ImmediateResponse | ProcessingResponse | None:
+    """Process incoming request headers.
+
+    See CalloutServer.on_request_headers.
+    """
+    return None
+
+  async def on_response_headers(
+      self,
+      headers: HttpHeaders,  # pylint: disable=unused-argument
+      context: grpc.aio.ServicerContext  # pylint: disable=unused-argument
+  ) -> HeadersResponse | None:
+    """Process incoming response headers.
+
+    See CalloutServer.on_response_headers.
+    """
+    return None
+
+  async def on_request_body(
+      self,
+      body: HttpBody,  # pylint: disable=unused-argument
+      context: grpc.aio.ServicerContext  # pylint: disable=unused-argument
+  ) -> BodyResponse | ImmediateResponse | None:
+    """Process an incoming request body.
+
+    See CalloutServer.on_request_body.
+    """
+    return None
+
+  async def on_response_body(
+      self,
+      body: HttpBody,  # pylint: disable=unused-argument
+      context: grpc.aio.ServicerContext  # pylint: disable=unused-argument
+  ) -> BodyResponse | None:
+    """Process an incoming response body.
+
+    See CalloutServer.on_response_body.
+    """
+    return None
+
+
+def _add_ports(server: grpc.Server | grpc.aio.Server,
+               processor: _ServerLifecycleMixin) -> str:
+  """Bind the callout server addresses requested by the processor.
+
+  Args:
+      server: grpc server to add the ports to.
+      processor: The callout server holding the address and TLS configuration.
+
+  Returns:
+      str: Description of the bound addresses, for logging.
+  """
+  listening = ''
+  if not processor.disable_tls:
+    # Built once per server and shared by every connection, so the TLS session
+    # ticket keys are too and resumed handshakes skip the key exchange.
+    server_credentials = grpc.ssl_server_credentials(
+      private_key_certificate_chain_pairs=[(processor.private_key,
+                                            processor.cert_chain)])
+    address_str = _addr_to_str(processor.secure_address)
+    server.add_secure_port(address_str, server_credentials)
+    listening += f', listening on {address_str} (secure)'
+  if processor.plaintext_address:
+    plaintext_address_str = _addr_to_str(processor.plaintext_address)
+    server.add_insecure_port(plaintext_address_str)
+    listening += f', listening on {plaintext_address_str} (plaintext)'
+  return listening
+
+
+def _reserve_port(address: tuple[str, int],
+                  reserved: list[socket.socket]) -> tuple[str, int]:
+  """Bind address with SO_REUSEPORT, without listening on it.
+
+  Args:
+      address: The address to reserve, its port may be 0.
+      reserved: List the bound socket is added to, to be closed on shutdown.
+
+  Returns:
+      tuple[str, int]: The address with the port that was bound.
+  """
+  family = socket.AF_INET6 if ':' in address[0] else socket.AF_INET
+  sock = socket.socket(family, socket.SOCK_STREAM)
+  sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+  sock.bind(address)
+  reserved.append(sock)
+  return (address[0], sock.getsockname()[1])
+
+
+def _worker_cpus(num_processes: int) -> list[int] | None:
+  """Pick a distinct CPU for each worker process to be pinned to.
+
+  Args:
+      num_processes: Number of worker processes.
+
+  Returns:
+      list[int]: One CPU per worker, or None if the platform does not support
+      affinity or there are fewer usable CPUs than workers.
+  """
+  if not hasattr(os, 'sched_setaffinity'):
+    return None
+  cpus = sorted(os.sched_getaffinity(0))
+  if len(cpus) < num_processes:
+    return None
+  return cpus[:num_processes]
+
+
+def _run_grpc_worker(processor: _ServerLifecycleMixin,
+                     cpu: int | None = None) -> None:
+  """Serve callouts from a worker process until the parent sends SIGTERM.
+
+  SIGTERM is handled like SIGINT, interrupting the serving loop so that the
+  grpc server is stopped gracefully.
+
+  Args:
+      processor: The callout server handling the callouts.
+      cpu: CPU to pin the worker to, keeping its grpc poller and Python
+        threads on one core.
+  """
+  signal.signal(signal.SIGTERM, signal.default_int_handler)
+  if cpu is not None:
+    os.sched_setaffinity(0, {cpu})
+  try:
+    processor._serve_worker()
+  except KeyboardInterrupt:
+    pass
+
+
+class _GRPCServiceMixin:
+  """Start, stop and wait on the grpc server of a callout service.
+
+  The service classes set `_server` and the `_start_msg` to log on start.
+  """
+
+  def stop(self, grace: float = 10) -> None:
+    self._server.stop(grace=grace)
+    self._server.wait_for_termination(timeout=grace + 1)
+    _logger.info('GRPC server stopped.')
 
   def loop(self) -> None:
     self._server.wait_for_termination()
 
   def start(self) -> None:
     self._server.start()
-    logging.info(self._start_msg)
+    _logger.info(self._start_msg)
+
+
+class _AsyncGRPCServiceMixin:
+  """Start, stop and wait on the grpc.aio server of a callout service.
+
+  The service classes set `_server` and the `_start_msg` to log on start.
+  """
+
+  async def stop(self, grace: float = 10) -> None:
+    await self._server.stop(grace=grace)
+    _logger.info('GRPC server stopped.')
+
+  async def loop(self) -> None:
+    await self._server.wait_for_termination()
+
+  async def start(self) -> None:
+    await self._server.start()
+    _logger.info(self._start_msg)
+
+
+class _GRPCCalloutService(_GRPCServiceMixin, ExternalProcessorServicer):
+  """GRPC based Callout server implementation."""
+
+  def __init__(self, processor: CalloutServer, *args, **kwargs):
+    self._processor = processor
+    self._server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=processor.server_thread_count),
+        options=processor.grpc_options)
+    add_ExternalProcessorServicer_to_server(self, self._server)
+    self._start_msg = 'GRPC callout server started' + _add_ports(
+        self._server, processor)
 
   def Process(
       self,
@@ -375,3 +900,24 @@ class _GRPCCalloutService(ExternalProcessorServicer):
     """Process the client callout."""
     for callout in callout_iterator:
       yield self._processor.process(callout, context)
+
+
+class _AsyncGRPCCalloutService(_AsyncGRPCServiceMixin,
+                               ExternalProcessorServicer):
+  """grpc.aio based Callout server implementation."""
+
+  def __init__(self, processor: CalloutServer, *args, **kwargs):
+    self._processor = processor
+    self._server = grpc.aio.server(options=processor.grpc_options)
+    add_ExternalProcessorServicer_to_server(self, self._server)
+    self._start_msg = 'GRPC async callout server started' + _add_ports(
+        self._server, processor)
+
+  async def Process(
+      self,
+      callout_iterator: AsyncIterable[ProcessingRequest],
+      context: grpc.aio.ServicerContext,
+  ) -> AsyncIterator[ProcessingResponse]:
+    """Process the client callout."""
+    async for callout in callout_iterator:
+      yield await self._processor.process(callout, context)
@@ -12,36 +12,75 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Library of commonly used methods within a callout server."""
-import argparse
+from __future__ import annotations
+
+import functools
 import logging
-import typing
-from typing import Union
+from typing import TYPE_CHECKING
 
-from envoy.config.core.v3.base_pb2 import HeaderValue
 from envoy.config.core.v3.base_pb2 import HeaderValueOption
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpBody
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpHeaders
-from envoy.service.ext_proc.v3.external_processor_pb2 import HeaderMutation
 from envoy.service.ext_proc.v3.external_processor_pb2 import BodyResponse
 from envoy.service.ext_proc.v3.external_processor_pb2 import HeadersResponse
 from envoy.service.ext_proc.v3.external_processor_pb2 import ImmediateResponse
 from envoy.type.v3.http_status_pb2 import StatusCode
+from google.protobuf.internal import api_implementation
 from google.protobuf.struct_pb2 import Struct
 import grpc
 
+if TYPE_CHECKING:
+  from google.protobuf.internal.containers import RepeatedCompositeFieldContainer
+
+_logger = logging.getLogger(__name__)
+
+if api_implementation.Type() == 'python':
+  _logger.warning(
+      'Using the pure Python protobuf backend, callouts will be much slower. '
+      'Install a protobuf release providing the upb backend.')
+
 _DYNAMIC_FORWARDING_METADATA_NAMESPACE = "com.google.envoy.dynamic_forwarding.selected_endpoints"
 
 
+def _encode(value: str | bytes) -> bytes:
+  """Encode a header value as UTF-8, passing pre-encoded bytes through as is."""
+  return value if isinstance(value, bytes) else value.encode()
+
+
+def _add_header_options(
+    set_headers: RepeatedCompositeFieldContainer[HeaderValueOption],
+    headers: list[tuple[str, str | bytes]],
+    append_action: HeaderValueOption.HeaderAppendAction | None,
+) -> None:
+  """Add a HeaderValueOption for each (key, value) pair to set_headers.
+
+  Options are created in place with add(), rather than constructed and then
+  copied into the repeated field.
+  """
+  for k, v in headers:
+    option = set_headers.add()
+    option.header.key = k
+    option.header.raw_value = _encode(v)
+    if append_action:
+      option.append_action = append_action
+
+
+# Serialized HeadersResponse that only clears the route cache.
+_CLEAR_ROUTE_CACHE_RESPONSE = HeadersResponse(
+    response={'clear_route_cache': True}).SerializeToString()
+
+
 def add_header_mutation(
-    add: list[tuple[str, str]] | None = None,
+    add: list[tuple[str, str | bytes]] | None = None,
     remove: list[str] | None = None,
     clear_route_cache: bool = False,
-    append_action: typing.Optional[HeaderValueOption.HeaderAppendAction] = None,
+    append_action: HeaderValueOption.HeaderAppendAction | None = None,
 ) -> HeadersResponse:
   """Generate a HeadersResponse mutation for incoming callouts.
 
   Args:
-    add: A list of tuples representing headers to add or replace.
+    add: A list of tuples representing headers to add or replace. Keys are
+      strings, values may be strings or pre-encoded bytes.
     remove: List of header strings to remove from the callout.
     clear_route_cache: If true, will enable clear_route_cache on the generated
       HeadersResponse.
@@ -49,22 +88,58 @@ def add_header_mutation(
   Returns:
     HeadersResponse: A configured header mutation response with the specified modifications.
   """
+  if not add and remove is None:
+    if clear_route_cache:
+      return HeadersResponse.FromString(_CLEAR_ROUTE_CACHE_RESPONSE)
+    return HeadersResponse()
   header_mutation = HeadersResponse()
+  response = header_mutation.response
+  mutation = response.header_mutation
   if add:
-    for k, v in add:
-      header_value_option = HeaderValueOption(
-          header=HeaderValue(key=k, raw_value=bytes(v, 'utf-8')))
-      if append_action:
-        header_value_option.append_action = append_action
-      header_mutation.response.header_mutation.set_headers.append(
-          header_value_option)
+    _add_header_options(mutation.set_headers, add, append_action)
   if remove is not None:
-    header_mutation.response.header_mutation.remove_headers.extend(remove)
+    mutation.remove_headers.extend(remove)
   if clear_route_cache:
-    header_mutation.response.clear_route_cache = True
+    response.clear_route_cache = True
   return header_mutation
 
 
+def add_header_mutation_cached(
+    add: tuple[tuple[str, str | bytes], ...] = (),
+    remove: tuple[str, ...] = (),
+    clear_route_cache: bool = False,
+    append_action: HeaderValueOption.HeaderAppendAction | None = None,
+) -> HeadersResponse:
+  """Cached variant of add_header_mutation for mutations repeated per request.
+
+  The response is built and serialized once per distinct set of arguments,
+  later calls only parse the cached bytes. Arguments must be hashable.
+
+  Args:
+    add: Tuple of (key, value) pairs representing headers to add or replace.
+    remove: Tuple of header strings to remove from the callout.
+    clear_route_cache: If true, will enable clear_route_cache on the generated
+      HeadersResponse.
+    append_action: Supported actions types for header append action.
+  Returns:
+    HeadersResponse: A new header mutation response, safe to modify.
+  """
+  return HeadersResponse.FromString(
+      _serialized_header_mutation(add, remove, clear_route_cache,
+                                  append_action))
+
+
+@functools.lru_cache(maxsize=256)
+def _serialized_header_mutation(
+    add: tuple[tuple[str, str | bytes], ...],
+    remove: tuple[str, ...],
+    clear_route_cache: bool,
+    append_action: HeaderValueOption.HeaderAppendAction | None,
+) -> bytes:
+  return add_header_mutation(list(add), list(remove), clear_route_cache,
+                             append_action).SerializeToString()
+
+
 def add_body_mutation(
     body: str | None = None,
     clear_body: bool = False,
@@ -85,19 +160,21 @@ def add_body_mutation(
     BodyResponse: A configured body mutation response with the specified modifications.
   """
   body_mutation = BodyResponse()
+  response = body_mutation.response
+  mutation = response.body_mutation
   if body:
-    body_mutation.response.body_mutation.body = bytes(body, 'utf-8')
+    mutation.body = body.encode()
     if (clear_body):
-      logging.warning("body and clear_body are mutually exclusive.")
+      _logger.warning("body and clear_body are mutually exclusive.")
   else:
-    body_mutation.response.body_mutation.clear_body = clear_body
+    mutation.clear_body = clear_body
   if clear_route_cache:
-    body_mutation.response.clear_route_cache = True
+    response.clear_route_cache = True
   return body_mutation
 
 
 def headers_contain(
-  http_headers: HttpHeaders, key: str, value: Union[str, None] = None
+  http_headers: HttpHeaders, key: str, value: str | None = None
 ) -> bool:
   """Check the headers for a matching key value pair.
 
@@ -116,6 +193,22 @@ def headers_contain(
   return False
 
 
+def headers_to_dict(http_headers: HttpHeaders) -> dict[str, bytes]:
+  """Index the headers by key, for callouts looking up several headers.
+
+  Builds the dict in a single pass, so each lookup afterwards is O(1) instead
+  of a scan over every header. For repeated keys the last value wins.
+
+  Args:
+    http_headers: Headers to index.
+  Returns:
+    A dict mapping each header key to its raw value.
+  """
+  return {
+      header.key: header.raw_value for header in http_headers.headers.headers
+  }
+
+
 def body_contains(http_body: HttpBody, body: str) -> bool:
   """Check the body for the presence of a substring.
 
@@ -127,7 +220,8 @@ def body_contains(http_body: HttpBody, body: str) -> bool:
   return body in http_body.body.decode('utf-8')
 
 
-def deny_callout(context, msg: str | None = None) -> None:
+def deny_callout(context: grpc.ServicerContext,
+                 msg: str | None = None) -> None:
   """Denies a gRPC callout, optionally logging a custom message.
 
   Args:
@@ -139,14 +233,14 @@ def deny_callout(context, msg: str | None = None) -> None:
       grpc.StatusCode.PERMISSION_DENIED: Always raised to deny the callout.
   """
   msg = msg or 'Callout DENIED.'
-  logging.warning(msg)
+  _logger.warning('%s', msg)
   context.abort(grpc.StatusCode.PERMISSION_DENIED, msg)
 
 
 def header_immediate_response(
     code: StatusCode,
-    headers: list[tuple[str, str]] | None = None,
-    append_action: Union[HeaderValueOption.HeaderAppendAction, None] = None,
+    headers: list[tuple[str, str | bytes]] | None = None,
+    append_action: HeaderValueOption.HeaderAppendAction | None = None,
 ) -> ImmediateResponse:
   """Creates an immediate HTTP response with specific headers and status code.
 
@@ -162,15 +256,8 @@ def header_immediate_response(
   immediate_response.status.code = code
 
   if headers:
-    header_mutation = HeaderMutation()
-    for k, v in headers:
-      header_value_option = HeaderValueOption(
-          header=HeaderValue(key=k, raw_value=bytes(v, 'utf-8')))
-      if append_action:
-        header_value_option.append_action = append_action
-      header_mutation.set_headers.append(header_value_option)
-
-    immediate_response.headers.CopyFrom(header_mutation)
+    _add_header_options(immediate_response.headers.set_headers, headers,
+                        append_action)
   return immediate_response
 
 
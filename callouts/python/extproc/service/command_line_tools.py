@@ -12,69 +12,84 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from __future__ import annotations
+
 import argparse
 
 def _addr(value: str) -> tuple[str, int] | None:
-  if not value:
-    return None
-  if ':' not in value:
+  """Parse a "host:port" address, IPv6 hosts are written as "[::1]:443"."""
+  if not value or ':' not in value:
     return None
-  address_values = value.split(':')
-  return (address_values[0], int(address_values[1]))
+  host, _, port = value.rpartition(':')
+  return (host.strip('[]'), int(port))
+
+
+def _addr_to_str(address: tuple[str, int]) -> str:
+  """Take in an address tuple and returns a formated ip string.
+
+  Args:
+      address: Address to transform.
+
+  Returns:
+      str: f'{address[0]}:{address[1]}', with IPv6 hosts in brackets.
+  """
+  if ':' in address[0]:
+    return f'[{address[0]}]:{address[1]}'
+  return f'{address[0]}:{address[1]}'
+
+
+# (flag, add_argument keyword arguments) for every CalloutServer option.
+_ARGUMENTS: list[tuple[str, dict]] = [
+    ('--secure_address', {
+        'type': _addr,
+        'help': 'Address for the secure (TLS) server with format: "0.0.0.0:443"',
+    }),
+    ('--plaintext_address', {
+        'type': _addr,
+        'help': 'Address for the plaintext (non grpc) server: "0.0.0.0:8080"',
+    }),
+    ('--health_check_address', {
+        'type': _addr,
+        'help': 'Health check address for the server with format: "0.0.0.0:80"',
+    }),
+    ('--secure_health_check', {
+        'action': "store_true",
+        'help': "Run a HTTPS health check rather than an HTTP one.",
+    }),
+    ('--combined_health_check', {
+        'action': "store_true",
+        'help': "Do not create a seperate health check server.",
+    }),
+    ('--disable_plaintext', {
+        'action': "store_true",
+        'help': 'Disables the plaintext address of the callout server.',
+    }),
+    ('--disable_tls', {
+        'action': "store_true",
+        'help': 'Disables the secure address of the callout server.',
+    }),
+    ('--cert_chain_path', {
+        'type': str,
+        'help': 'File path to the cert chain to use for TLS.',
+        'default': argparse.SUPPRESS,
+    }),
+    ('--private_key_path', {
+        'type': str,
+        'help': 'File path to the private key to use for TLS.',
+        'default': argparse.SUPPRESS,
+    }),
+]
 
 
 def add_command_line_args() -> argparse.ArgumentParser:
   """Adds command line args that can be passed to the CalloutServer constructor.
 
+  Returns a new parser on every call, so callers may add their own arguments.
+
   Returns:
       argparse.ArgumentParser: Configured argument parser with callout server options.
   """
   parser = argparse.ArgumentParser()
-  parser.add_argument(
-      '--secure_address',
-      type=_addr,
-      help='Address for the secure (TLS) server with format: "0.0.0.0:443"',
-  )
-  parser.add_argument(
-      '--plaintext_address',
-      type=_addr,
-      help='Address for the plaintext (non grpc) server: "0.0.0.0:8080"',
-  )
-  parser.add_argument(
-      '--health_check_address',
-      type=_addr,
-      help='Health check address for the server with format: "0.0.0.0:80"',
-  )
-  parser.add_argument(
-      '--secure_health_check',
-      action="store_true",
-      help="Run a HTTPS health check rather than an HTTP one.",
-  )
-  parser.add_argument(
-      '--combined_health_check',
-      action="store_true",
-      help="Do not create a seperate health check server.",
-  )
-  parser.add_argument(
-      '--disable_plaintext',
-      action="store_true",
-      help='Disables the plaintext address of the callout server.',
-  )
-  parser.add_argument(
-      '--disable_tls',
-      action="store_true",
-      help='Disables the secure address of the callout server.',
-  )
-  parser.add_argument(
-      '--cert_chain_path',
-      type=str,
-      help='File path to the cert chain to use for TLS.',
-      default=argparse.SUPPRESS,
-  )
-  parser.add_argument(
-      '--private_key_path',
-      type=str,
-      help='File path to the private key to use for TLS.',
-      default=argparse.SUPPRESS,
-  )
+  for flag, kwargs in _ARGUMENTS:
+    parser.add_argument(flag, **kwargs)
   return parser
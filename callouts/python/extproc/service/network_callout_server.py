@@ -18,14 +18,22 @@ Extends the base callout server functionality for network-level data.
 """
 
 from concurrent import futures
-from dataclasses import dataclass
-from http.server import BaseHTTPRequestHandler
-from http.server import HTTPServer
+import functools
+from http.server import ThreadingHTTPServer
 import logging
+import multiprocessing
+import os
+import socket
 import ssl
-from typing import Iterator, Tuple
+import threading
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Callable
 from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
 
+from envoy.service.network_ext_proc.v3.network_external_processor_pb2 import Data
 from envoy.service.network_ext_proc.v3.network_external_processor_pb2 import ProcessingRequest
 from envoy.service.network_ext_proc.v3.network_external_processor_pb2 import ProcessingResponse
 from envoy.service.network_ext_proc.v3.network_external_processor_pb2_grpc import (
@@ -35,10 +43,37 @@ from envoy.service.network_ext_proc.v3.network_external_processor_pb2_grpc impor
 
 import grpc
 from google.protobuf.struct_pb2 import Struct
+from extproc.service.callout_server import _add_ports
+from extproc.service.callout_server import _AsyncGRPCServiceMixin
+from extproc.service.callout_server import _AsyncServerLifecycleMixin
+from extproc.service.callout_server import _GRPCServiceMixin
+from extproc.service.callout_server import _PROCESS_LOCAL_STATE
+from extproc.service.callout_server import _read_cert_file
+from extproc.service.callout_server import _ServerLifecycleMixin
+from extproc.service.callout_server import HealthCheckService
 from grpc import ServicerContext
 
-@dataclass
-class ProcessingResult:
+_logger = logging.getLogger(__name__)
+
+# ProcessingResponse enum values, bound once for the per-message path.
+_STATUS_MODIFIED = ProcessingResponse.MODIFIED
+_STATUS_UNMODIFIED = ProcessingResponse.UNMODIFIED
+_CONNECTION_CLOSE = ProcessingResponse.CLOSE
+
+# Server channel options for long lived streams of small data frames.
+_DEFAULT_GRPC_OPTIONS: dict[str, int | str] = {
+    'grpc.max_receive_message_length': 16 * 1024 * 1024,
+    'grpc.max_send_message_length': 16 * 1024 * 1024,
+    'grpc.max_concurrent_streams': 1000,
+    'grpc.keepalive_time_ms': 30_000,
+    'grpc.keepalive_timeout_ms': 5_000,
+    'grpc.keepalive_permit_without_calls': 1,
+    'grpc.http2.min_time_between_pings_ms': 10_000,
+    'grpc.http2.max_pings_without_data': 0,
+    'grpc.so_reuseport': 1,
+}
+
+class ProcessingResult(NamedTuple):
   """Holds the result of data processing from a callout handler.
 
   Attributes:
@@ -49,27 +84,7 @@ class ProcessingResult:
   modified: bool
 
 
-def _addr_to_str(address: tuple[str, int]) -> str:
-  """Take in an address tuple and returns a formated ip string.
-
-  Args:
-      address: Address to transform.
-
-  Returns:
-      str: f'{address[0]}:{address[1]}'
-  """
-  return f'{address[0]}:{address[1]}'
-
-class HealthCheckService(BaseHTTPRequestHandler):
-  """Server for responding to health check pings."""
-
-  def do_GET(self) -> None:
-    """Returns an empty page with 200 status code."""
-    self.send_response(200)
-    self.end_headers()
-
-
-class NetworkCalloutServer:
+class NetworkCalloutServer(_ServerLifecycleMixin):
   """Server wrapper for managing callout servers and processing callouts.
 
   Attributes:
@@ -92,8 +107,31 @@ class NetworkCalloutServer:
     cert_chain_path: Relative file path to the cert_chain.
     private_key: PEM private key of the server.
     private_key_path: Relative file path pointing to a file containing private_key data.
-    server_thread_count: Threads allocated to the main grpc service.
+    server_thread_count: Threads allocated to the main grpc service. Defaults
+      to four per CPU, up to 32, as callouts mostly wait on the stream. Use
+      several processes rather than more threads for CPU bound handlers.
+    executor: Executor running the grpc handlers. If set, server_thread_count
+      is ignored.
+    grpc_options: Channel arguments for the grpc server, as (key, value) pairs.
+      Entries override the matching defaults in _DEFAULT_GRPC_OPTIONS.
+    num_processes: Number of grpc worker processes to start. When greater
+      than 1, each worker binds the same addresses with SO_REUSEPORT and the
+      kernel balances connections between them, allowing CPU bound handlers
+      to scale past the GIL. Workers are started from a forkserver, so the
+      server instance must be picklable, and executor is not used. Requires
+      a platform supporting forkserver and SO_REUSEPORT (Linux); elsewhere
+      keep the default of 1.
+    pin_worker_cpus: If True, and there are at least num_processes usable
+      CPUs, pins each worker process to a distinct CPU of the parent's
+      affinity set. Only pin when the server has those CPUs to itself.
+      Defaults to False.
   """
+
+  _process_local_state = _PROCESS_LOCAL_STATE + ('executor',)
+  _forkserver_preload = [__name__]
+  # The callout port always serves TLS, next to the optional plaintext one.
+  disable_tls = False
+
   def __init__(
       self,
       address: tuple[str, int] | None = None,
@@ -110,12 +148,26 @@ class NetworkCalloutServer:
       cert_chain_path: str | None = './extproc/ssl_creds/chain.pem',
       private_key: bytes | None = None,
       private_key_path: str = './extproc/ssl_creds/privatekey.pem',
-      server_thread_count: int = 2,
+      server_thread_count: int | None = None,
+      executor: futures.Executor | None = None,
+      grpc_options: list[tuple[str, int | str]] | None = None,
+      num_processes: int = 1,
+      pin_worker_cpus: bool = False,
   ):
     self._setup = False
+    # Set once the servers are started, for callers waiting on startup.
+    self._ready = threading.Event()
     self._shutdown = False
     self._closed = False
-    self._health_check_server: HTTPServer | None = None
+    self._health_check_server: ThreadingHTTPServer | None = None
+    self._callout_server: _GRPCCalloutService | None = None
+    # The default should_close_connection never closes, skip calling it.
+    self._close_check = (
+        None if type(self).should_close_connection
+        is NetworkCalloutServer.should_close_connection
+        else self.should_close_connection)
+    self._workers: list[multiprocessing.Process] = []
+    self._reserved_sockets: list[socket.socket] = []
     default_ip = default_ip or '0.0.0.0'
 
     self.address: tuple[str, int] = address or (default_ip, 443)
@@ -135,13 +187,15 @@ class NetworkCalloutServer:
         self.health_check_address = (self.health_check_address[0],
                                      health_check_port)
 
-    def _read_cert_file(path: str | None) -> bytes | None:
-      if path:
-        with open(path, 'rb') as file:
-          return file.read()
-      return None
-
-    self.server_thread_count = server_thread_count
+    self.server_thread_count = server_thread_count or min(
+        32, (os.cpu_count() or 1) * 4)
+    self.executor = executor
+    if num_processes < 1:
+      raise ValueError('num_processes must be at least 1.')
+    self.num_processes = num_processes
+    self.pin_worker_cpus = pin_worker_cpus
+    self.grpc_options = list(
+        (_DEFAULT_GRPC_OPTIONS | dict(grpc_options or ())).items())
     self.secure_health_check = secure_health_check
     # Read cert data.
     self.private_key = private_key or _read_cert_file(private_key_path)
@@ -149,73 +203,36 @@ class NetworkCalloutServer:
 
     if secure_health_check:
       if not private_key_path:
-        logging.error("Secure health check requires a private_key_path.")
-        return
-      if not cert_chain_path:
-        logging.error("Secure health check requires a cert_chain_path.")
-        return
-      self.health_check_ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
-      self.health_check_ssl_context.load_cert_chain(certfile=cert_chain_path,
-                                                    keyfile=private_key_path)
-
-    self._callout_server = _GRPCCalloutService(self)
-
-  def run(self) -> None:
-    """Start all requested servers and listen for new connections; blocking."""
-    self._start_servers()
-    self._setup = True
-    try:
-      self._loop_server()
-    except KeyboardInterrupt:
-      logging.info('Server interrupted')
-    finally:
-      self._stop_servers()
-      self._closed = True
-
-  def _start_servers(self) -> None:
-    """Start the requested servers."""
-    if self.health_check_address:
-      self._health_check_server = HTTPServer(self.health_check_address,
-                                             HealthCheckService)
-      protocol = 'HTTP'
-      if self.secure_health_check:
-        protocol = 'HTTPS'
-        self._health_check_server.socket = (
-          self.health_check_ssl_context.wrap_socket(
-            sock=self._health_check_server.socket,))
-
-      logging.info('%s health check server bound to %s.', protocol,
-                   _addr_to_str(self.health_check_address))
-    self._callout_server.start()
-
-  def _stop_servers(self) -> None:
-    """Close the sockets of all servers, and trigger shutdowns."""
-    if self._health_check_server:
-      self._health_check_server.server_close()
-      self._health_check_server.shutdown()
-      logging.info('Health check server stopped.')
-
-    if self._callout_server:
-      self._callout_server.stop()
-
-  def _loop_server(self) -> None:
-    """Loop server forever, calling shutdown will cause the server to stop."""
-
-    # We chose the main serving thread based on what server configuration
-    # was requested. Defaults to the health check thread.
-    if self._health_check_server:
-      logging.info("Health check server started.")
-      self._health_check_server.serve_forever()
-    else:
-      # If the only server requested is a grpc callout server, we wait on the grpc server.
-      self._callout_server.loop()
-
-  def shutdown(self) -> None:
-    """Tell the server to shutdown, ending all serving threads."""
-    if self._health_check_server:
-      self._health_check_server.shutdown()
-    if self._callout_server:
-      self._callout_server.stop()
+        _logger.error("Secure health check requires a private_key_path.")
+      elif not cert_chain_path:
+        _logger.error("Secure health check requires a cert_chain_path.")
+      else:
+        self.health_check_ssl_context = ssl.SSLContext(
+            ssl.PROTOCOL_TLS_SERVER)
+        self.health_check_ssl_context.load_cert_chain(
+            certfile=cert_chain_path, keyfile=private_key_path)
+
+    # Worker processes create their own grpc server, the parent does not
+    # serve callouts itself.
+    if self.num_processes == 1:
+      self._callout_server = self._create_callout_service()
+
+  def __setstate__(self, state: dict) -> None:
+    super().__setstate__(state)
+    self.executor = None
+
+  @property
+  def secure_address(self) -> tuple[str, int]:
+    """The address of the TLS callout port, same as `address`."""
+    return self.address
+
+  @secure_address.setter
+  def secure_address(self, address: tuple[str, int]) -> None:
+    self.address = address
+
+  def _create_callout_service(self) -> '_GRPCCalloutService | None':
+    """Create the grpc service handling the callouts."""
+    return _GRPCCalloutService(self)
 
   def process(
       self,
@@ -231,58 +248,85 @@ class NetworkCalloutServer:
     Returns:
         ProcessingResponse: A response for the incoming callout.
     """
-    response = ProcessingResponse()
+    return self._process_into(callout, context, ProcessingResponse())
 
-    # Handle read data (client->server)
-    if callout.HasField('read_data'):
-      data = callout.read_data.data
-      end_of_stream = callout.read_data.end_of_stream
-
-      # Process the data through callback
-      processed_data, modified = self.on_read_data(data, end_of_stream, context)
-      
-      # Build response
-      response.read_data.data = processed_data
-      response.read_data.end_of_stream = end_of_stream
-      response.data_processing_status = (
-          ProcessingResponse.MODIFIED if modified
-          else ProcessingResponse.UNMODIFIED
-      )
-
-      # Check connection control
-      conn_status = self.should_close_connection(data, modified, context)
-
-    # Handle write data (server->client)
-    elif callout.HasField('write_data'):
-      data = callout.write_data.data
-      end_of_stream = callout.write_data.end_of_stream
+  def _stream_processor(
+      self) -> Callable[[ProcessingRequest, ServicerContext],
+                        ProcessingResponse]:
+    """Returns the callable handling the callouts of one stream.
 
-      # Process the data through callback
-      processed_data, modified = self.on_write_data(data, end_of_stream, context)
+    Unless `process` is overridden, one response message is reused for the
+    whole stream, as grpc serializes each response before the next callout.
+    """
+    if type(self).process is not NetworkCalloutServer.process:
+      return self.process
+    return functools.partial(self._process_into, response=ProcessingResponse())
 
-      # Build response
-      response.write_data.data = processed_data
-      response.write_data.end_of_stream = end_of_stream
-      response.data_processing_status = (
-          ProcessingResponse.MODIFIED if modified
-          else ProcessingResponse.UNMODIFIED
-      )
+  def _process_into(
+      self,
+      callout: ProcessingRequest,
+      context: ServicerContext,
+      response: ProcessingResponse,
+  ) -> ProcessingResponse:
+    """Process a callout, building the response in `response`.
 
-      # Check connection control
-      conn_status = self.should_close_connection(data, modified, context)
+    Args:
+        callout: The incoming network callout.
+        context: Stream context on the callout.
+        response: Message to build the response in, cleared first.
 
-    else:
-      logging.warning("Received request with no data")
-      return response
+    Returns:
+        ProcessingResponse: `response`, filled for the incoming callout.
+    """
+    response.Clear()
 
-    # Set connection status
-    response.connection_status = (
-        ProcessingResponse.CLOSE if conn_status
-        else ProcessingResponse.CONTINUE
-    )
+    if callout.HasField('read_data'):
+      # Client to server.
+      self._process_data(callout.read_data, response.read_data,
+                         self.on_read_data, response, context)
+    elif callout.HasField('write_data'):
+      # Server to client.
+      self._process_data(callout.write_data, response.write_data,
+                         self.on_write_data, response, context)
+    else:
+      _logger.warning("Received request with no data")
 
     return response
 
+  def _process_data(
+      self,
+      request_data: Data,
+      response_data: Data,
+      callback: Callable[[bytes, bool, ServicerContext], ProcessingResult],
+      response: ProcessingResponse,
+      context: ServicerContext,
+  ) -> None:
+    """Runs callback over one direction of the stream and fills the response.
+
+    Args:
+        request_data: The read_data or write_data message of the callout.
+        response_data: The matching data message of the response.
+        callback: Either on_read_data or on_write_data.
+        response: The response being built.
+        context: Stream context on the callout.
+    """
+    data = request_data.data
+    end_of_stream = request_data.end_of_stream
+    processed_data, modified = callback(data, end_of_stream, context)
+
+    # Envoy forwards the returned bytes in place of its own buffer, so the
+    # data is sent back whether or not it was modified.
+    response_data.data = processed_data
+    response.data_processing_status = (
+        _STATUS_MODIFIED if modified else _STATUS_UNMODIFIED)
+    # False is the proto default.
+    if end_of_stream:
+      response_data.end_of_stream = True
+    # CONTINUE is the proto default, only a close has to be set.
+    close_check = self._close_check
+    if close_check is not None and close_check(data, modified, context):
+      response.connection_status = _CONNECTION_CLOSE
+
   def on_read_data(
       self,
       data: bytes,
@@ -334,36 +378,34 @@ class NetworkCalloutServer:
     return False
 
 
-class _GRPCCalloutService(NetworkExternalProcessorServicer):
+class AsyncNetworkCalloutServer(_AsyncServerLifecycleMixin,
+                                NetworkCalloutServer):
+  """NetworkCalloutServer serving callouts with grpc.aio.
+
+  Each data frame is handled on the event loop instead of being handed to a
+  thread of the grpc executor. `process` and the data callbacks stay
+  synchronous and must not block, as they run on the event loop. Accepts the
+  same arguments as NetworkCalloutServer, except for `server_thread_count` and
+  `executor`. With `num_processes` greater than 1 every worker process runs
+  its own event loop.
+  """
+
+  def _create_async_callout_service(self) -> '_AsyncGRPCCalloutService':
+    """Create the grpc.aio service handling the callouts."""
+    return _AsyncGRPCCalloutService(self)
+
+
+class _GRPCCalloutService(_GRPCServiceMixin, NetworkExternalProcessorServicer):
   """GRPC based Callout server implementation."""
 
-  def __init__(self, processor, *args, **kwargs):
+  def __init__(self, processor: NetworkCalloutServer, *args, **kwargs):
     self._processor = processor
-    self._server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=processor.server_thread_count))
+    self._server = grpc.server(processor.executor or futures.ThreadPoolExecutor(
+        max_workers=processor.server_thread_count,
+        thread_name_prefix='grpc-callout'), options=processor.grpc_options)
     add_NetworkExternalProcessorServicer_to_server(self, self._server)
-    server_credentials = grpc.ssl_server_credentials(
-        private_key_certificate_chain_pairs=[(processor.private_key,
-                                              processor.cert_chain)])
-    address_str = _addr_to_str(processor.address)
-    self._server.add_secure_port(address_str, server_credentials)
-    self._start_msg = f'GRPC callout server started, listening on {address_str}.'
-    if processor.plaintext_address:
-      plaintext_address_str = _addr_to_str(processor.plaintext_address)
-      self._server.add_insecure_port(plaintext_address_str)
-      self._start_msg += f' (secure) and {plaintext_address_str} (plaintext)'
-
-  def stop(self) -> None:
-    self._server.stop(grace=10)
-    self._server.wait_for_termination(timeout=10)
-    logging.info('GRPC server stopped.')
-
-  def loop(self) -> None:
-    self._server.wait_for_termination()
-
-  def start(self) -> None:
-    self._server.start()
-    logging.info(self._start_msg)
+    self._start_msg = 'GRPC callout server started' + _add_ports(
+        self._server, processor)
 
   def Process(
       self,
@@ -371,5 +413,28 @@ class _GRPCCalloutService(NetworkExternalProcessorServicer):
       context: ServicerContext,
   ) -> Iterator[ProcessingResponse]:
     """Process the client callout."""
+    process = self._processor._stream_processor()
     for callout in callout_iterator:
-      yield self._processor.process(callout, context)
+      yield process(callout, context)
+
+
+class _AsyncGRPCCalloutService(_AsyncGRPCServiceMixin,
+                               NetworkExternalProcessorServicer):
+  """grpc.aio based Callout server implementation."""
+
+  def __init__(self, processor: NetworkCalloutServer, *args, **kwargs):
+    self._processor = processor
+    self._server = grpc.aio.server(options=processor.grpc_options)
+    add_NetworkExternalProcessorServicer_to_server(self, self._server)
+    self._start_msg = 'GRPC async callout server started' + _add_ports(
+        self._server, processor)
+
+  async def Process(
+      self,
+      callout_iterator: AsyncIterable[ProcessingRequest],
+      context: grpc.aio.ServicerContext,
+  ) -> AsyncIterator[ProcessingResponse]:
+    """Process the client callout."""
+    process = self._processor._stream_processor()
+    async for callout in callout_iterator:
+      yield process(callout, context)
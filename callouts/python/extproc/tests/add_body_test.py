@@ -23,36 +23,28 @@ from extproc.example.add_body.service_callout_example import (
     CalloutServerExample as CalloutServerTest)
 from extproc.tests.basic_grpc_test import (
     make_request,
-    setup_server,
-    get_plaintext_channel,
-    default_kwargs,
+    grpc_only_kwargs,
 )
 
-# Import the setup server test fixture.
-_ = setup_server
-_local_test_args = {'kwargs': default_kwargs, 'test_class': CalloutServerTest}
+_local_test_args = {'kwargs': grpc_only_kwargs, 'test_class': CalloutServerTest}
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_mock_request_body_handling(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
+def test_mock_request_body_handling(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  mock_body = service_pb2.HttpBody(body=b'mock-body')
+  response = make_request(stub, request_body=mock_body)
 
-    mock_body = service_pb2.HttpBody(body=b'mock-body')
-    response = make_request(stub, request_body=mock_body)
-
-    assert response.request_body.response.body_mutation.body == b'mock-body-added-request-body'
+  assert response.request_body.response.body_mutation.body == b'mock-body-added-request-body'
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_mock_response_body_handling(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    mock_body = service_pb2.HttpBody(body=b'mock-body')
-    response = make_request(stub, response_body=mock_body)
+def test_mock_response_body_handling(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  mock_body = service_pb2.HttpBody(body=b'mock-body')
+  response = make_request(stub, response_body=mock_body)
 
-    assert response.response_body.response.body_mutation.body == b'new-body'
+  assert response.response_body.response.body_mutation.body == b'new-body'
 
 
 class ClearTestServer(callout_server.CalloutServer):
@@ -65,26 +57,22 @@ class ClearTestServer(callout_server.CalloutServer):
     return callout_tools.add_body_mutation(clear_body=True)
 
 
-_clear_test_args = {'kwargs': default_kwargs, 'test_class': ClearTestServer}
+_clear_test_args = {'kwargs': grpc_only_kwargs, 'test_class': ClearTestServer}
 
 
 @pytest.mark.parametrize('server', [_clear_test_args], indirect=True)
-def test_clear_request_body_handling(server: ClearTestServer) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
+def test_clear_request_body_handling(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  mock_body = service_pb2.HttpBody(body=b'inital-body')
+  response = make_request(stub, request_body=mock_body)
 
-    mock_body = service_pb2.HttpBody(body=b'inital-body')
-    response = make_request(stub, request_body=mock_body)
-
-    assert response.request_body.response.body_mutation.body == b''
+  assert response.request_body.response.body_mutation.body == b''
 
 
 @pytest.mark.parametrize('server', [_clear_test_args], indirect=True)
-def test_clear_response_body_handling(server: ClearTestServer) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    mock_body = service_pb2.HttpBody(body=b'inital-body')
-    response = make_request(stub, response_body=mock_body)
+def test_clear_response_body_handling(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  mock_body = service_pb2.HttpBody(body=b'inital-body')
+  response = make_request(stub, response_body=mock_body)
 
-    assert response.response_body.response.body_mutation.body == b''
\ No newline at end of file
+  assert response.response_body.response.body_mutation.body == b''
\ No newline at end of file
@@ -23,87 +23,60 @@ import pytest
 from extproc.example.add_custom_response.service_callout_example import (
     CalloutServerExample as CalloutServerTest)
 from extproc.tests.basic_grpc_test import (
+    make_batched_request,
     make_request,
-    setup_server,
-    get_plaintext_channel,
-    default_kwargs,
+    grpc_only_kwargs,
+    header_keys,
 )
 
 
-# Import the setup server test fixture.
-_ = setup_server
-_local_test_args = {"kwargs": default_kwargs, "test_class": CalloutServerTest}
+_local_test_args = {"kwargs": grpc_only_kwargs, "test_class": CalloutServerTest}
 
-
-@pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_mock_header_handling(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    header_map = HeaderMap()
-    header_value = HeaderValue(key="mock", raw_value=b"true")
-    header_map.headers.extend([header_value])
-
-    mock_headers = service_pb2.HttpHeaders(headers=header_map,
-                                           end_of_stream=True)
-
-    response = make_request(stub, request_headers=mock_headers)
-    assert response.HasField('request_headers')
-    assert any(header.header.key == "Mock-Response" for header in
-               response.request_headers.response.header_mutation.set_headers)
-
-    response = make_request(stub, response_headers=mock_headers)
-    assert response.HasField('response_headers')
-    assert any(header.header.key == "Mock-Response" for header in
-               response.response_headers.response.header_mutation.set_headers)
+# Callout payloads shared by the tests, none of them mutate these.
+_MOCK_HEADERS = service_pb2.HttpHeaders(
+    headers=HeaderMap(headers=[HeaderValue(key="mock", raw_value=b"true")]),
+    end_of_stream=True)
+_MOCK_BODY = service_pb2.HttpBody(body=b"body-check-mock")
+_BAD_HEADERS = service_pb2.HttpHeaders(
+    headers=HeaderMap(headers=[HeaderValue(key="bad-header", raw_value=b"")]),
+    end_of_stream=True)
+_BAD_BODY = service_pb2.HttpBody(body=b"bad-body")
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_mock_body_handling(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    mock_body = service_pb2.HttpBody(body=b"body-check-mock")
-
-    response = make_request(stub, request_body=mock_body)
-    assert response.HasField('request_body')
-    assert response.request_body.response.body_mutation.body == b"Mocked-Body"
-
-    response = make_request(stub, response_body=mock_body)
-    assert response.HasField('response_body')
-    assert response.response_body.response.body_mutation.body == b"Mocked-Body"
+def test_mock_handling(stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  # The callouts do not depend on each other, send them on one stream.
+  request_headers, response_headers, request_body, response_body = (
+      make_batched_request(stub, [
+          service_pb2.ProcessingRequest(request_headers=_MOCK_HEADERS),
+          service_pb2.ProcessingRequest(response_headers=_MOCK_HEADERS),
+          service_pb2.ProcessingRequest(request_body=_MOCK_BODY),
+          service_pb2.ProcessingRequest(response_body=_MOCK_BODY),
+      ]))
+
+  assert request_headers.HasField('request_headers')
+  assert "Mock-Response" in header_keys(
+      request_headers.request_headers.response.header_mutation)
+  assert response_headers.HasField('response_headers')
+  assert "Mock-Response" in header_keys(
+      response_headers.response_headers.response.header_mutation)
+
+  assert request_body.HasField('request_body')
+  assert request_body.request_body.response.body_mutation.body == b"Mocked-Body"
+  assert response_body.HasField('response_body')
+  assert response_body.response_body.response.body_mutation.body == b"Mocked-Body"
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_header_validation_failure(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    header_map = HeaderMap()
-    header_value = HeaderValue(key="bad-header", raw_value=b"")
-    header_map.headers.extend([header_value])
-
-    bad_headers = service_pb2.HttpHeaders(headers=header_map,
-                                              end_of_stream=True)
-
-    with pytest.raises(grpc.RpcError) as e:
-      make_request(stub, request_headers=bad_headers)
-    assert e.value.code() == grpc.StatusCode.PERMISSION_DENIED
-    with pytest.raises(grpc.RpcError) as e:
-      make_request(stub, response_headers=bad_headers)
-    assert e.value.code() == grpc.StatusCode.PERMISSION_DENIED
-
-
-@pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_body_validation_failure(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    bad_body = service_pb2.HttpBody(body=b"bad-body")
-
-    with pytest.raises(grpc.RpcError) as e:
-      make_request(stub, request_body=bad_body)
-    assert e.value.code() == grpc.StatusCode.PERMISSION_DENIED
-    with pytest.raises(grpc.RpcError) as e:
-      make_request(stub, response_body=bad_body)
-    assert e.value.code() == grpc.StatusCode.PERMISSION_DENIED
+@pytest.mark.parametrize('field, payload', [
+    ('request_headers', _BAD_HEADERS),
+    ('response_headers', _BAD_HEADERS),
+    ('request_body', _BAD_BODY),
+    ('response_body', _BAD_BODY),
+])
+def test_validation_failure(
+    stub: service_pb2_grpc.ExternalProcessorStub, field: str,
+    payload: service_pb2.HttpHeaders | service_pb2.HttpBody) -> None:
+  with pytest.raises(grpc.RpcError) as e:
+    make_request(stub, **{field: payload})
+  assert e.value.code() == grpc.StatusCode.PERMISSION_DENIED
@@ -13,20 +13,20 @@
 # limitations under the License.
 from __future__ import print_function
 
-import datetime
+import asyncio
 from http.server import BaseHTTPRequestHandler
 from http.server import HTTPServer
 import threading
-import time
-from typing import Iterator, Callable, Any, Mapping
 import urllib.error
 import urllib.request
 import ssl
 
+from envoy.service.ext_proc.v3.external_processor_pb2 import HeaderMutation
 from envoy.service.ext_proc.v3.external_processor_pb2 import ProcessingResponse
 from envoy.service.ext_proc.v3.external_processor_pb2 import ProcessingRequest
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpHeaders
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpBody
+from envoy.service.ext_proc.v3.external_processor_pb2 import HeadersResponse
 from envoy.service.ext_proc.v3.external_processor_pb2_grpc import ExternalProcessorStub
 import grpc
 import pytest
@@ -34,8 +34,12 @@ import pytest
 from extproc.example.basic.service_callout_example import (
   BasicCalloutServer as CalloutServerTest,
 )
+from extproc.service.callout_server import AsyncCalloutServer
 from extproc.service.callout_server import CalloutServer, _addr_to_str
 from extproc.service.callout_tools import add_body_mutation, add_header_mutation
+from extproc.tests.testing_tools import default_kwargs
+from extproc.tests.testing_tools import get_plaintext_channel
+from extproc.tests.testing_tools import grpc_only_kwargs
 
 
 class ServerSetupException(Exception):
@@ -46,116 +50,101 @@ class NoResponseError(Exception):
   pass
 
 
-# Replace the default ports of the server so that they do not clash with running programs.
-default_kwargs: dict = {
-    'secure_address': ('localhost', 8443),
-    'health_check_address': ('localhost', 8000),
-    'disable_tls': False
-}
 # Arguments for running a custom CalloutServer with testing parameters.
 _local_test_args: dict = {
     "kwargs": default_kwargs,
     "test_class": CalloutServerTest
 }
 
+# Responses expected from the basic example server, built once.
+_EXPECTED_REQUEST_BODY = add_body_mutation(body='replaced-body')
+_EXPECTED_RESPONSE_BODY = add_body_mutation(clear_body=True)
+_EXPECTED_RESPONSE_HEADERS = add_header_mutation(
+    add=[('hello', 'service-extensions')])
+_EXPECTED_REQUEST_HEADERS = add_header_mutation(
+    add=[(':authority', 'service-extensions.com'), (':path', '/'),
+         ('header-request', 'request')],
+    clear_route_cache=True,
+    remove=['foo'])
 
-def get_plaintext_channel(server: CalloutServer) -> grpc.Channel:
-  """From a CalloutServer, obtain the plaintext address and create a grpc channel pointing to it.
-
-  Args:
-      server: Server to connect to.
-  Returns:
-      grpc.Channel: Open channel to the server.
-  """
-  addr = server.plaintext_address
-  return grpc.insecure_channel(_addr_to_str(addr) if addr else '')
-
-
-def wait_till_server(server_check: Callable[[], bool], timeout: int = 10):
-  """Wait untill the `server_check` function returns true.
 
-  Used for blocking until the server reaches a given state.
-  Times out after a given time.
+def make_request(stub: ExternalProcessorStub, **kwargs) -> ProcessingResponse:
+  """Make a request to the server.
 
   Args:
-      server_check: Function to check.
-      timeout: Wait time. Defaults to 10.
+    stub: The server stub.
+    **kwargs: Parameters to input into the ProcessingRequest.
+
+  Returns: The response returned from the server.
   """
-  expiration = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
-  while not server_check() and datetime.datetime.now() < expiration:
-    time.sleep(1)
+  responses = stub.Process(iter([ProcessingRequest(**kwargs)]))
+  try:
+    return next(responses)
+  except StopIteration:
+    raise NoResponseError("Response not found.") from None
+  finally:
+    # Release the stream now rather than when the call is garbage collected.
+    responses.cancel()
 
 
-def _start_server(server: CalloutServer) -> threading.Thread:
-  # Start the server in a background thread
-  thread = threading.Thread(target=server.run)
-  thread.daemon = True
-  thread.start()
-  # Wait for the server to start
-  wait_till_server(lambda: server._setup)
-  return thread
+def header_keys(mutation: HeaderMutation) -> set[str]:
+  """Collect the keys of the headers set by a header mutation.
 
+  Args:
+    mutation: The header mutation to read.
 
-def _stop_server(server: CalloutServer, thread: threading.Thread):
-  # Stop the server
-  server.shutdown()
-  thread.join(timeout=5)
+  Returns: The set header keys.
+  """
+  return {option.header.key for option in mutation.set_headers}
 
 
-@pytest.fixture(scope='class', name='server')
-def setup_server(request) -> Iterator[CalloutServer]:
-  """Set up basic CalloutServer.
+async def make_request_async(stub: ExternalProcessorStub,
+                             **kwargs) -> ProcessingResponse:
+  """Make a request to the server from a grpc.aio channel.
 
-  Takes in two optional pytest parameters.
-  'kwargs': Arguments passed into the server constructor. 
-    Default is the value of default_kwargs.
-  'test_class': Class to use when constructing the server.
-    Default is the base CalloutServer.
+  Args:
+    stub: The server stub, on a grpc.aio channel.
+    **kwargs: Parameters to input into the ProcessingRequest.
 
-  Yields:
-      Iterator[CalloutServer]: The server to test with.
+  Returns: The response returned from the server.
   """
-  params: dict = request.param or {'kwargs': {}, 'test_class': None}
-  kwargs: Mapping[str, Any] = default_kwargs | params['kwargs']
-  # Either use the provided class or create a server using the default CalloutServer class.
-  server = (params['test_class'] or CalloutServer)(**kwargs)
+  call = stub.Process(iter([ProcessingRequest(**kwargs)]))
   try:
-    thread = _start_server(server)
-    yield server
-    _stop_server(server, thread)
+    async for response in call:
+      return response
   finally:
-    del server
+    call.cancel()
+  raise NoResponseError("Response not found.")
 
 
-def make_request(stub: ExternalProcessorStub, **kwargs) -> ProcessingResponse:
-  """Make a request to the server.
+def make_batched_request(
+    stub: ExternalProcessorStub,
+    requests: list[ProcessingRequest]) -> list[ProcessingResponse]:
+  """Send several requests to the server over a single stream.
 
   Args:
     stub: The server stub.
-    **kwargs: Parameters to input into the ProcessingRequest.
+    requests: The requests to send, in order.
 
-  Returns: The response returned from the server.
+  Returns: The responses returned from the server, one per request.
   """
-  request_iter = iter([ProcessingRequest(**kwargs)])
-  responses = stub.Process(request_iter)
-  # Get the first response
-  for response in responses:
-    return response
-  raise NoResponseError("Response not found.")
+  responses = list(stub.Process(iter(requests)))
+  if len(responses) != len(requests):
+    raise NoResponseError(
+        f"Expected {len(requests)} responses, got {len(responses)}.")
+  return responses
 
 
 class TestBasicServer(object):
   """Unmodified server functionality test."""
 
   @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-  def test_basic_server_capabilites(self, server: CalloutServerTest) -> None:
+  def test_basic_server_capabilites(
+      self, server: CalloutServerTest,
+      ssl_creds: grpc.ChannelCredentials) -> None:
     """Test the request and response functionality of the server."""
-    chain_cert: bytes = b''
-    with open('./extproc/ssl_creds/chain.pem', 'rb') as file:
-      chain_cert = file.read()
-    creds = grpc.ssl_channel_credentials(chain_cert)
     with grpc.secure_channel(f'{_addr_to_str(server.secure_address)}',
-                             creds) as channel:
+                             ssl_creds) as channel:
       stub = ExternalProcessorStub(channel)
 
       body = HttpBody(end_of_stream=False)
@@ -163,25 +152,20 @@ class TestBasicServer(object):
       end_headers = HttpHeaders(end_of_stream=True)
 
       value = make_request(stub, request_body=body)
-      assert value.HasField('request_body')
-      assert value.request_body == add_body_mutation(body='replaced-body')
+      assert value.WhichOneof('response') == 'request_body'
+      assert value.request_body == _EXPECTED_REQUEST_BODY
 
       value = make_request(stub, response_body=body)
-      assert value.HasField('response_body')
-      assert value.response_body == add_body_mutation(clear_body=True)
+      assert value.WhichOneof('response') == 'response_body'
+      assert value.response_body == _EXPECTED_RESPONSE_BODY
 
       value = make_request(stub, response_headers=headers)
-      assert value.HasField('response_headers')
-      assert value.response_headers == add_header_mutation(
-          add=[('hello', 'service-extensions')])
+      assert value.WhichOneof('response') == 'response_headers'
+      assert value.response_headers == _EXPECTED_RESPONSE_HEADERS
 
       value = make_request(stub, request_headers=headers)
-      assert value.HasField('request_headers')
-      assert value.request_headers == add_header_mutation(
-          add=[(':authority', 'service-extensions.com'), (':path', '/'),
-               ('header-request', 'request')],
-          clear_route_cache=True,
-          remove=['foo'])
+      assert value.WhichOneof('response') == 'request_headers'
+      assert value.request_headers == _EXPECTED_REQUEST_HEADERS
 
       make_request(stub, request_headers=end_headers)
 
@@ -234,7 +218,7 @@ def test_custom_server_config() -> None:
     thread = threading.Thread(target=test_server.run)
     thread.daemon = True
     thread.start()
-    wait_till_server(lambda: test_server._setup)
+    test_server._ready.wait(timeout=10)
 
     response = urllib.request.urlopen(f'http://{ip}:{health_check_port}')
     assert response.read() == b''
@@ -244,9 +228,8 @@ def test_custom_server_config() -> None:
       stub = ExternalProcessorStub(channel)
       value = make_request(stub,
                            response_headers=HttpHeaders(end_of_stream=True))
-      assert value.HasField('response_headers')
-      assert value.response_headers == add_header_mutation(
-          add=[('hello', 'service-extensions')])
+      assert value.WhichOneof('response') == 'response_headers'
+      assert value.response_headers == _EXPECTED_RESPONSE_HEADERS
 
     # Stop the server
     test_server.shutdown()
@@ -278,3 +261,44 @@ def test_custom_server_no_health_check(server: CalloutServerTest) -> None:
   test_server = HTTPServer(address, BaseHTTPRequestHandler)
   del test_server
   assert server._health_check_server is None
+
+
+class AsyncTestServer(AsyncCalloutServer):
+  """Async callout server adding a response header."""
+
+  async def on_response_headers(self, _, __) -> HeadersResponse:
+    return add_header_mutation(add=[('hello', 'service-extensions')])
+
+
+_async_test_args: dict = {
+    "kwargs": default_kwargs,
+    "test_class": AsyncTestServer
+}
+
+
+@pytest.mark.parametrize('server', [_async_test_args], indirect=True)
+def test_async_server(stub: ExternalProcessorStub) -> None:
+  """Test that the grpc.aio based server processes callouts."""
+  value = make_request(stub, response_headers=HttpHeaders(end_of_stream=True))
+  assert value.WhichOneof('response') == 'response_headers'
+  assert value.response_headers == _EXPECTED_RESPONSE_HEADERS
+
+  value = make_request(stub, request_body=HttpBody(end_of_stream=True))
+  assert value.WhichOneof('response') != 'request_body'
+
+
+@pytest.mark.parametrize('server', [_async_test_args], indirect=True)
+def test_async_server_concurrent_streams(server: AsyncTestServer) -> None:
+  """Test that concurrent streams from a grpc.aio client are all served."""
+
+  async def make_requests(count: int) -> list[ProcessingResponse]:
+    address = _addr_to_str(server.plaintext_address)
+    async with grpc.aio.insecure_channel(address) as channel:
+      stub = ExternalProcessorStub(channel)
+      return await asyncio.gather(*(
+          make_request_async(
+              stub, response_headers=HttpHeaders(end_of_stream=True))
+          for _ in range(count)))
+
+  for value in asyncio.run(make_requests(16)):
+    assert value.response_headers == _EXPECTED_RESPONSE_HEADERS
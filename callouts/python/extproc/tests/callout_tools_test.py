@@ -0,0 +1,58 @@
+# Copyright 2026 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from envoy.config.core.v3.base_pb2 import HeaderMap
+from envoy.config.core.v3.base_pb2 import HeaderValue
+from envoy.service.ext_proc.v3.external_processor_pb2 import HeadersResponse
+from envoy.service.ext_proc.v3.external_processor_pb2 import HttpHeaders
+
+from extproc.service.callout_tools import add_header_mutation
+from extproc.service.callout_tools import add_header_mutation_cached
+from extproc.service.callout_tools import headers_to_dict
+
+
+def test_add_header_mutation_cached() -> None:
+  """Test that the cached mutation matches and is not shared between calls."""
+  add = (('hello', 'service-extensions'), ('foo', b'bar'))
+  first = add_header_mutation_cached(add=add, remove=('baz',),
+                                     clear_route_cache=True)
+  assert first == add_header_mutation(add=list(add), remove=['baz'],
+                                      clear_route_cache=True)
+  first.response.clear_route_cache = False
+  second = add_header_mutation_cached(add=add, remove=('baz',),
+                                      clear_route_cache=True)
+  assert second.response.clear_route_cache
+
+
+def test_add_header_mutation_empty_remove() -> None:
+  """Test that an empty remove list still sets the header mutation."""
+  expected = HeadersResponse()
+  expected.response.header_mutation.remove_headers.extend([])
+  expected.response.clear_route_cache = True
+  assert add_header_mutation(remove=[], clear_route_cache=True) == expected
+
+  expected = HeadersResponse()
+  expected.response.header_mutation.remove_headers.extend([])
+  assert add_header_mutation(remove=[]) == expected
+
+
+def test_headers_to_dict() -> None:
+  """Test that headers are indexed by key with their raw values."""
+  headers = HttpHeaders(headers=HeaderMap(headers=[
+      HeaderValue(key=':authority', raw_value=b'example.com'),
+      HeaderValue(key='foo', raw_value=b'bar'),
+  ]))
+  assert headers_to_dict(headers) == {
+      ':authority': b'example.com',
+      'foo': b'bar'
+  }
@@ -0,0 +1,91 @@
+# Copyright 2026 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared pytest fixtures for the callout server tests."""
+
+import threading
+from typing import Any, Iterator, Mapping
+
+from envoy.service.ext_proc.v3.external_processor_pb2_grpc import ExternalProcessorStub
+import grpc
+import pytest
+
+from extproc.service.callout_server import CalloutServer
+from extproc.tests.testing_tools import default_kwargs
+from extproc.tests.testing_tools import get_plaintext_channel
+
+
+def _start_server(server: CalloutServer) -> threading.Thread:
+  # Start the server in a background thread
+  thread = threading.Thread(target=server.run)
+  thread.daemon = True
+  thread.start()
+  # Wait for the server to start
+  server._ready.wait(timeout=10)
+  return thread
+
+
+def _stop_server(server: CalloutServer, thread: threading.Thread):
+  # Stop the server, the tests leave no callouts in flight.
+  server.shutdown(grace=0)
+  thread.join(timeout=5)
+
+
+@pytest.fixture(scope='session', name='server')
+def setup_server(request) -> Iterator[CalloutServer]:
+  """Set up basic CalloutServer.
+
+  The server is shared by every test in the session requesting the same
+  parameters, and is only rebuilt when the parameters change.
+
+  Takes in two optional pytest parameters.
+  'kwargs': Arguments passed into the server constructor. 
+    Default is the value of default_kwargs.
+  'test_class': Class to use when constructing the server.
+    Default is the base CalloutServer.
+
+  Yields:
+      Iterator[CalloutServer]: The server to test with.
+  """
+  params: dict = request.param or {'kwargs': {}, 'test_class': None}
+  kwargs: Mapping[str, Any] = default_kwargs | params['kwargs']
+  # Either use the provided class or create a server using the default CalloutServer class.
+  server = (params['test_class'] or CalloutServer)(**kwargs)
+  try:
+    thread = _start_server(server)
+    yield server
+    _stop_server(server, thread)
+  finally:
+    del server
+
+
+@pytest.fixture(scope='module', name='stub')
+def setup_stub(server: CalloutServer) -> Iterator[ExternalProcessorStub]:
+  """Open a plaintext channel to the server, shared by the tests of a module.
+
+  The channel is connected before the first test runs, so that test does not
+  absorb the connection setup.
+
+  Yields:
+      Iterator[ExternalProcessorStub]: A stub on the open channel.
+  """
+  with get_plaintext_channel(server) as channel:
+    grpc.channel_ready_future(channel).result(timeout=5)
+    yield ExternalProcessorStub(channel)
+
+
+@pytest.fixture(scope='session', name='ssl_creds')
+def setup_ssl_creds() -> grpc.ChannelCredentials:
+  """Channel credentials trusting the test server certificate chain."""
+  with open('./extproc/ssl_creds/chain.pem', 'rb') as file:
+    return grpc.ssl_channel_credentials(file.read())
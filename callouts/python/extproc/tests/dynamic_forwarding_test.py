@@ -24,40 +24,34 @@ from extproc.example.dynamic_forwarding.service_callout_example import (
     CalloutServerExample as CalloutServerTest)
 from extproc.tests.basic_grpc_test import (
     make_request,
-    setup_server,
-    get_plaintext_channel,
     default_kwargs
 )
 
-# Import the setup server test fixture.
-_ = setup_server
 _local_test_args = {"kwargs": default_kwargs, "test_class": CalloutServerTest}
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_request_headers_dynamic_metadata(server: CalloutServerTest) -> None:
+def test_request_headers_dynamic_metadata(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
   """Test the dynamic metadata response from the server."""
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    def make_test_headers(host_value: bytes) -> service_pb2.HttpHeaders:
-      return service_pb2.HttpHeaders(headers=HeaderMap(
-          headers=[HeaderValue(key='ip-to-return', raw_value=host_value)]),
-                                     end_of_stream=False)
-    first_ip = make_test_headers(b'10.1.10.2')
-    second_ip = make_test_headers(b'10.1.10.3')
-    no_headers = service_pb2.HttpHeaders(end_of_stream=False)
-    end_headers = service_pb2.HttpHeaders(end_of_stream=True)
-
-    value = make_request(stub, request_headers=first_ip)
-    expected_metadata = callout_tools.build_dynamic_forwarding_metadata('10.1.10.2',80)
-    assert value.dynamic_metadata == expected_metadata
-    value = make_request(stub, request_headers=second_ip)
-    expected_metadata = callout_tools.build_dynamic_forwarding_metadata('10.1.10.3',80)
-    assert value.dynamic_metadata == expected_metadata
-    value = make_request(stub, request_headers=no_headers)
-    expected_metadata = callout_tools.build_dynamic_forwarding_metadata('10.1.10.4',80)
-    assert value.dynamic_metadata == expected_metadata
-
-    make_request(stub, request_headers=end_headers)
+  def make_test_headers(host_value: bytes) -> service_pb2.HttpHeaders:
+    return service_pb2.HttpHeaders(headers=HeaderMap(
+        headers=[HeaderValue(key='ip-to-return', raw_value=host_value)]),
+                                   end_of_stream=False)
+  first_ip = make_test_headers(b'10.1.10.2')
+  second_ip = make_test_headers(b'10.1.10.3')
+  no_headers = service_pb2.HttpHeaders(end_of_stream=False)
+  end_headers = service_pb2.HttpHeaders(end_of_stream=True)
+
+  value = make_request(stub, request_headers=first_ip)
+  expected_metadata = callout_tools.build_dynamic_forwarding_metadata('10.1.10.2',80)
+  assert value.dynamic_metadata == expected_metadata
+  value = make_request(stub, request_headers=second_ip)
+  expected_metadata = callout_tools.build_dynamic_forwarding_metadata('10.1.10.3',80)
+  assert value.dynamic_metadata == expected_metadata
+  value = make_request(stub, request_headers=no_headers)
+  expected_metadata = callout_tools.build_dynamic_forwarding_metadata('10.1.10.4',80)
+  assert value.dynamic_metadata == expected_metadata
+
+  make_request(stub, request_headers=end_headers)
 
@@ -28,7 +28,6 @@ from envoy.service.ext_proc.v3.external_processor_pb2 import HttpBody
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpHeaders
 from extproc.example.ext_proc_client import make_json_request
 from extproc.tests.basic_grpc_test import (
-  setup_server,
   default_kwargs,
 )
 
@@ -37,8 +36,6 @@ from extproc.service.callout_tools import (
   add_header_mutation,
 )
 
-# Import the setup server test fixture.
-_ = setup_server
 _local_test_args = {'kwargs': default_kwargs, 'test_class': CalloutServerTest}
 
 
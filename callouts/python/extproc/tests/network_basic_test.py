@@ -0,0 +1,59 @@
+# Copyright 2026 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from envoy.service.network_ext_proc.v3.network_external_processor_pb2 import ProcessingRequest
+from envoy.service.network_ext_proc.v3.network_external_processor_pb2 import ProcessingResponse
+import pytest
+
+from extproc.l4_example.network_basic.network_service_callout_example import (
+    BasicCalloutServer as CalloutServerTest)
+from extproc.service.network_callout_server import NetworkCalloutServer
+
+
+@pytest.mark.parametrize('test_class',
+                         [NetworkCalloutServer, CalloutServerTest])
+@pytest.mark.parametrize('field', ['read_data', 'write_data'])
+def test_unmodified_data_round_trip(test_class: type, field: str) -> None:
+  """Test that unmodified data is sent back to envoy unchanged."""
+  # The callouts are processed directly, the grpc server is never started.
+  server = test_class(address=('localhost', 0),
+                      plaintext_address=('localhost', 0))
+  callout = ProcessingRequest(
+      **{field: {'data': b'pass-through', 'end_of_stream': True}})
+
+  response = server.process(callout, None)
+
+  assert response.data_processing_status == ProcessingResponse.UNMODIFIED
+  assert getattr(response, field).data == b'pass-through'
+  assert getattr(response, field).end_of_stream
+
+
+class _ProcessOverrideServer(NetworkCalloutServer):
+  """Overrides process with its original two argument signature."""
+
+  def process(self, callout: ProcessingRequest,
+              context: None) -> ProcessingResponse:
+    response = super().process(callout, context)
+    response.read_data.data = b'overridden'
+    return response
+
+
+def test_process_override_is_used() -> None:
+  """Test that streams call an overridden process with two arguments."""
+  server = _ProcessOverrideServer(address=('localhost', 0),
+                                  plaintext_address=('localhost', 0))
+  process = server._stream_processor()
+
+  response = process(ProcessingRequest(read_data={'data': b'data'}), None)
+
+  assert response.read_data.data == b'overridden'
@@ -3,13 +3,12 @@ import urllib.request
 import json
 
 from extproc.example.e2e_tests.observability_server import ObservabilityServerExample
-from extproc.tests.basic_grpc_test import make_request, setup_server, get_plaintext_channel, default_kwargs
+from extproc.tests.basic_grpc_test import make_request, get_plaintext_channel, default_kwargs
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpHeaders
 from envoy.service.ext_proc.v3.external_processor_pb2 import HttpBody
 from envoy.service.ext_proc.v3.external_processor_pb2_grpc import ExternalProcessorStub
 
-# Set up test fixture.
-_ = setup_server
+# Arguments for the server fixture.
 _local_test_args: dict = {
     "kwargs": default_kwargs | {'health_check_address': ('0.0.0.0', 8008),
         'plaintext_address': ("0.0.0.0", 1248)},
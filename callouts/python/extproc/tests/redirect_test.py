@@ -25,33 +25,27 @@ from extproc.example.redirect.service_callout_example import (
     CalloutServerExample as CalloutServerTest,)
 from extproc.service.callout_tools import header_immediate_response
 from extproc.tests.basic_grpc_test import (
-    setup_server,
-    get_plaintext_channel,
     default_kwargs,
     make_request,
 )
 
-# Import the setup server test fixture.
-_ = setup_server
 _local_test_args = {"kwargs": default_kwargs, "test_class": CalloutServerTest}
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_header_immediate_response(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    # Construct the HeaderMap
-    header_map = HeaderMap()
-    header_value = HeaderValue(key="header", raw_value=b"value")
-    header_map.headers.extend([header_value])
-
-    # Construct HttpHeaders with the HeaderMap
-    headers = service_pb2.HttpHeaders(headers=header_map, end_of_stream=True)
-
-    response = make_request(stub, request_headers=headers)
-
-    assert response.HasField('immediate_response')
-    assert response.immediate_response == header_immediate_response(
-        code=typing.cast(StatusCode, 301),
-        headers=[('Location', 'http://service-extensions.com/redirect')])
+def test_header_immediate_response(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  # Construct the HeaderMap
+  header_map = HeaderMap()
+  header_value = HeaderValue(key="header", raw_value=b"value")
+  header_map.headers.extend([header_value])
+
+  # Construct HttpHeaders with the HeaderMap
+  headers = service_pb2.HttpHeaders(headers=header_map, end_of_stream=True)
+
+  response = make_request(stub, request_headers=headers)
+
+  assert response.HasField('immediate_response')
+  assert response.immediate_response == header_immediate_response(
+      code=typing.cast(StatusCode, 301),
+      headers=[('Location', 'http://service-extensions.com/redirect')])
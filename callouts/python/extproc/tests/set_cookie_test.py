@@ -23,43 +23,35 @@ from extproc.service import callout_tools
 from extproc.example.set_cookie.service_callout_example import (
     CalloutServerExample as CalloutServerTest,)
 from extproc.tests.basic_grpc_test import (
-    setup_server,
-    get_plaintext_channel,
     default_kwargs,
     make_request,
 )
 
-# Import the setup server test fixture.
-_ = setup_server
 _local_test_args = {"kwargs": default_kwargs, "test_class": CalloutServerTest}
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_header_set_cookie_for_particular_request(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
+def test_header_set_cookie_for_particular_request(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  # Construct the HeaderMap
+  header_map = HeaderMap()
+  header_value = HeaderValue(key="cookie-check", raw_value=b"value")
+  header_map.headers.extend([header_value])
 
-    # Construct the HeaderMap
-    header_map = HeaderMap()
-    header_value = HeaderValue(key="cookie-check", raw_value=b"value")
-    header_map.headers.extend([header_value])
+  # Construct HttpHeaders with the HeaderMap
+  headers = service_pb2.HttpHeaders(headers=header_map, end_of_stream=True)
 
-    # Construct HttpHeaders with the HeaderMap
-    headers = service_pb2.HttpHeaders(headers=header_map, end_of_stream=True)
+  response = make_request(stub, response_headers=headers)
 
-    response = make_request(stub, response_headers=headers)
+  assert response.HasField('response_headers')
+  assert response.response_headers == callout_tools.add_header_mutation(
+      add=[('Set-Cookie', 'your_cookie_name=cookie_value; Max-Age=3600; Path=/')])
 
-    assert response.HasField('response_headers')
-    assert response.response_headers == callout_tools.add_header_mutation(
-        add=[('Set-Cookie', 'your_cookie_name=cookie_value; Max-Age=3600; Path=/')])
-    
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_header_not_set_cookie_without_header(server: CalloutServerTest) -> None:
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
+def test_header_not_set_cookie_without_header(
+    stub: service_pb2_grpc.ExternalProcessorStub) -> None:
+  headers = service_pb2.HttpHeaders(end_of_stream=False)
 
-    headers = service_pb2.HttpHeaders(end_of_stream=False)
+  response = make_request(stub, response_headers=headers)
 
-    response = make_request(stub, response_headers=headers)
-
-    assert not response.HasField('response_headers')
\ No newline at end of file
+  assert not response.HasField('response_headers')
\ No newline at end of file
@@ -0,0 +1,61 @@
+# Copyright 2026 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Server arguments and helpers shared by conftest.py and the tests."""
+
+import socket
+
+import grpc
+
+from extproc.service.callout_server import CalloutServer, _addr_to_str
+
+
+def _unused_ports(count: int) -> list[int]:
+  """Ask the OS for `count` distinct free ports on localhost.
+
+  All the sockets are held open until every port is picked, so the OS cannot
+  hand out the same port twice.
+  """
+  sockets = [socket.socket() for _ in range(count)]
+  try:
+    for sock in sockets:
+      sock.bind(('localhost', 0))
+    return [sock.getsockname()[1] for sock in sockets]
+  finally:
+    for sock in sockets:
+      sock.close()
+
+
+_secure_port, _plaintext_port, _health_check_port = _unused_ports(3)
+# Replace the default ports of the server so that they do not clash with
+# running programs, or with each other across test modules.
+default_kwargs: dict = {
+    'secure_address': ('localhost', _secure_port),
+    'plaintext_address': ('localhost', _plaintext_port),
+    'health_check_address': ('localhost', _health_check_port),
+    'disable_tls': False
+}
+# For tests that only make grpc calls, skips binding the health check server.
+grpc_only_kwargs: dict = default_kwargs | {'combined_health_check': True}
+
+
+def get_plaintext_channel(server: CalloutServer) -> grpc.Channel:
+  """From a CalloutServer, obtain the plaintext address and create a grpc channel pointing to it.
+
+  Args:
+      server: Server to connect to.
+  Returns:
+      grpc.Channel: Open channel to the server.
+  """
+  addr = server.plaintext_address
+  return grpc.insecure_channel(_addr_to_str(addr) if addr else '')
@@ -0,0 +1,64 @@
+# Copyright 2026 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pathlib
+import socket
+import ssl
+import subprocess
+import sys
+import time
+
+from extproc.tests.testing_tools import _unused_ports
+
+# grpc picks a suite other than this one when left to its own list.
+_CIPHER_SUITE = 'ECDHE-RSA-AES128-GCM-SHA256'
+_ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def _negotiated_cipher(port: int, timeout: float = 10) -> str:
+  """Complete a TLS 1.2 handshake with the server and return its cipher."""
+  context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+  context.check_hostname = False
+  context.verify_mode = ssl.CERT_NONE
+  context.maximum_version = ssl.TLSVersion.TLSv1_2
+  context.set_alpn_protocols(['h2'])
+  deadline = time.monotonic() + timeout
+  while True:
+    try:
+      with socket.create_connection(('localhost', port), timeout=1) as sock:
+        with context.wrap_socket(sock) as tls:
+          return tls.cipher()[0]
+    except OSError:
+      if time.monotonic() > deadline:
+        raise
+      time.sleep(0.05)
+
+
+def test_cipher_suites_from_environment() -> None:
+  """Test that the secure server only negotiates the exported suites."""
+  port, = _unused_ports(1)
+  server = subprocess.Popen(
+      [
+          sys.executable, '-m', 'extproc.example.basic.service_callout_example',
+          '--secure_address', f'localhost:{port}', '--disable_plaintext',
+          '--combined_health_check'
+      ],
+      cwd=_ROOT,
+      env=os.environ | {'GRPC_SSL_CIPHER_SUITES': _CIPHER_SUITE},
+  )
+  try:
+    assert _negotiated_cipher(port) == _CIPHER_SUITE
+  finally:
+    server.terminate()
+    server.wait(timeout=15)
@@ -23,41 +23,34 @@ from extproc.example.update_header.service_callout_example import (
 )
 from extproc.service import callout_tools
 from extproc.tests.basic_grpc_test import (
-  get_plaintext_channel,
   default_kwargs,
   make_request,
-  setup_server,
 )
 
 
-# Import the setup server test fixture.
-_ = setup_server
 _local_test_args = {"kwargs": default_kwargs, "test_class": CalloutServerTest}
 
 
 @pytest.mark.parametrize('server', [_local_test_args], indirect=True)
-def test_append_action(server: CalloutServerTest) -> None:
+def test_append_action(stub: service_pb2_grpc.ExternalProcessorStub) -> None:
   """Test the request and response functionality of the server."""
 
-  with get_plaintext_channel(server) as channel:
-    stub = service_pb2_grpc.ExternalProcessorStub(channel)
-
-    headers = service_pb2.HttpHeaders(end_of_stream=False)
-    end_headers = service_pb2.HttpHeaders(end_of_stream=True)
-
-    value = make_request(stub, response_headers=headers)
-    assert value.HasField('response_headers')
-    assert value.response_headers == callout_tools.add_header_mutation(
-        add=[('header-response', 'response-new-value')],
-        append_action=HeaderValueOption.HeaderAppendAction.
-        OVERWRITE_IF_EXISTS_OR_ADD)
-
-    value = make_request(stub, request_headers=headers)
-    assert value.HasField('request_headers')
-    assert value.request_headers == callout_tools.add_header_mutation(
-        add=[('header-request', 'request-new-value')],
-        append_action=HeaderValueOption.HeaderAppendAction.
-        OVERWRITE_IF_EXISTS_OR_ADD,
-        clear_route_cache=True)
-
-    make_request(stub, request_headers=end_headers)
+  headers = service_pb2.HttpHeaders(end_of_stream=False)
+  end_headers = service_pb2.HttpHeaders(end_of_stream=True)
+
+  value = make_request(stub, response_headers=headers)
+  assert value.HasField('response_headers')
+  assert value.response_headers == callout_tools.add_header_mutation(
+      add=[('header-response', 'response-new-value')],
+      append_action=HeaderValueOption.HeaderAppendAction.
+      OVERWRITE_IF_EXISTS_OR_ADD)
+
+  value = make_request(stub, request_headers=headers)
+  assert value.HasField('request_headers')
+  assert value.request_headers == callout_tools.add_header_mutation(
+      add=[('header-request', 'request-new-value')],
+      append_action=HeaderValueOption.HeaderAppendAction.
+      OVERWRITE_IF_EXISTS_OR_ADD,
+      clear_route_cache=True)
+
+  make_request(stub, request_headers=end_headers)